@@ -0,0 +1,102 @@
+"""
+Near-duplicate filter
+=====================
+MinHash signatures over word shingles, banded into LSH buckets, so reworded
+reposts and crossposts can be dropped locally before they cost LLM tokens.
+
+Items are clustered greedily: each batch is visited heaviest first (by the
+caller's weight, e.g. engagement) and either starts a cluster or is folded
+into the first earlier representative whose estimated Jaccard similarity
+clears the threshold. The representative keeps a `similar` count of what it
+absorbed. An index can be carried across batches, so a stream only ever
+forwards items unlike anything it has already forwarded.
+"""
+
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+NUM_PERM  = 64
+BANDS     = 16          # 16 bands × 4 rows → candidates from roughly 0.5 similarity up
+PRIME     = (1 << 31) - 1
+SEED      = 1729
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, k: int = 3) -> set[str]:
+    """Lower-cased word k-grams; texts shorter than k words are one shingle."""
+    words = _WORD.findall(text.lower())
+    if len(words) < k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+class LSHIndex:
+    """Representatives seen so far, bucketed by MinHash band."""
+
+    def __init__(self, threshold: float, k: int = 3, num_perm: int = NUM_PERM, bands: int = BANDS):
+        rng = np.random.default_rng(SEED)
+        self.a = rng.integers(1, PRIME, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, PRIME, num_perm, dtype=np.uint64)
+        self.threshold = threshold
+        self.k = k
+        self.rows = num_perm // bands
+        self.buckets = [defaultdict(list) for _ in range(bands)]
+        self.reps: list[tuple[dict, np.ndarray]] = []
+        self.folded = 0
+
+    def signature(self, text: str) -> np.ndarray | None:
+        grams = shingles(text, self.k)
+        if not grams:
+            return None
+        h = np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+        return ((self.a[:, None] * h[None, :] + self.b[:, None]) % PRIME).min(axis=1)
+
+    def _bands(self, sig: np.ndarray):
+        for i, bucket in enumerate(self.buckets):
+            yield bucket, sig[i * self.rows:(i + 1) * self.rows].tobytes()
+
+    def match(self, sig: np.ndarray) -> dict | None:
+        """Earliest representative whose estimated Jaccard with `sig` clears the threshold."""
+        candidates = sorted({j for bucket, key in self._bands(sig) for j in bucket.get(key, ())})
+        for j in candidates:
+            rep, rep_sig = self.reps[j]
+            if (rep_sig == sig).mean() >= self.threshold:
+                return rep
+        return None
+
+    def insert(self, item: dict, sig: np.ndarray):
+        j = len(self.reps)
+        self.reps.append((item, sig))
+        for bucket, key in self._bands(sig):
+            bucket[key].append(j)
+
+
+def dedupe(items: list[dict], text, weight, threshold: float = 0.6, k: int = 3,
+           index: LSHIndex | None = None) -> list[dict]:
+    """
+    Drop near-duplicates from `items`, keeping the heaviest of each cluster.
+    `text(item)` is what gets compared and `weight(item)` picks the
+    representative. Pass the same `index` for every batch of a stream.
+    Survivors come back in their original order.
+    """
+    index = index or LSHIndex(threshold, k)
+    order = sorted(range(len(items)), key=lambda i: weight(items[i]), reverse=True)
+    keep = set()
+    for i in order:
+        item = items[i]
+        sig = index.signature(text(item))
+        if sig is None:
+            keep.add(i)
+            continue
+        rep = index.match(sig)
+        if rep is None:
+            index.insert(item, sig)
+            keep.add(i)
+        else:
+            rep["similar"] = rep.get("similar", 0) + 1 + item.get("similar", 0)
+            index.folded += 1
+    return [items[i] for i in sorted(keep)]
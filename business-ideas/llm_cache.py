@@ -0,0 +1,98 @@
+"""
+On-disk LLM response cache
+==========================
+SQLite store of prompt → reply for the scout agents. The key is a SHA-256 of
+the prompt template, the rendered inputs, the model name, temperature and
+max_tokens, so editing one agent's prompt only invalidates that agent: a
+formatting tweak to the report step still replays the extractor and scorer.
+
+Entries older than MAX_AGE are dropped on open, and once the store grows past
+MAX_BYTES the least recently used replies go first.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DAY = 24 * 60 * 60
+
+MAX_AGE   = 7 * DAY
+MAX_BYTES = 64 * 1024 * 1024
+
+
+def cache_key(messages: list[tuple[str, str]], inputs: dict, llm) -> str:
+    """Content hash of everything that determines the reply."""
+    payload = {
+        "messages":    messages,
+        "inputs":      inputs,
+        "model":       getattr(llm, "model", None) or getattr(llm, "model_name", None),
+        "temperature": getattr(llm, "temperature", None),
+        "max_tokens":  getattr(llm, "max_tokens", None),
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Thread-safe key → reply text store with age and size limits."""
+
+    def __init__(self, path: Path, max_age: float = MAX_AGE, max_bytes: int = MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS replies ("
+            " key TEXT PRIMARY KEY, reply TEXT, size INTEGER, created_at REAL, used_at REAL)"
+        )
+        self._db.commit()
+        self.evict()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT reply FROM replies WHERE key = ? AND created_at >= ?", (key, now - self.max_age)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._db.execute("UPDATE replies SET used_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+        return row[0]
+
+    def put(self, key: str, reply: str):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO replies VALUES (?, ?, ?, ?, ?)",
+                (key, reply, len(reply.encode("utf-8")), now, now),
+            )
+            self._db.commit()
+        self.evict()
+
+    def evict(self):
+        """Drop expired replies, then least recently used ones until under max_bytes."""
+        with self._lock:
+            self._db.execute("DELETE FROM replies WHERE created_at < ?", (time.time() - self.max_age,))
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM replies").fetchone()[0]
+            if total > self.max_bytes:
+                freed, doomed = 0, []
+                for key, size in self._db.execute("SELECT key, size FROM replies ORDER BY used_at"):
+                    if total - freed <= self.max_bytes:
+                        break
+                    doomed.append((key,))
+                    freed += size
+                self._db.executemany("DELETE FROM replies WHERE key = ?", doomed)
+            self._db.commit()
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        return f"LLM cache: {self.hits}/{lookups} hits" if lookups else "LLM cache: unused"
@@ -0,0 +1,64 @@
+"""
+Prompt packing
+==============
+Token-budgeted selection and batching for the scout agents, in place of
+fixed post / character / idea caps.
+
+Tokens are estimated locally at CHARS_PER_TOKEN UTF-8 bytes per token, a
+slightly pessimistic figure for English under Claude's tokenizer (emoji and
+non-Latin text cost more bytes, so they are charged more too). That keeps a
+packed call under its budget without a tokenizer dependency or an API call.
+"""
+
+import math
+
+CHARS_PER_TOKEN = 3.5
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text.encode("utf-8")) / CHARS_PER_TOKEN) if text else 0
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """`text` cut at a word boundary to about `max_tokens`, with an ellipsis if cut."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    cut = text.encode("utf-8")[:int(max_tokens * CHARS_PER_TOKEN) - 3].decode("utf-8", "ignore")
+    space = cut.rfind(" ")
+    return (cut[:space] if space > len(cut) // 2 else cut).rstrip() + "…"
+
+
+def pack(items: list, cost, value, budget: int) -> tuple[list, int]:
+    """
+    Fill `budget` tokens with the items worth the most per token (`value(item)`
+    / `cost(item)`), skipping any that no longer fit. Returns the kept items in
+    their original order and the tokens they use.
+    """
+    costs = [max(1, cost(item)) for item in items]
+    order = sorted(range(len(items)), key=lambda i: value(items[i]) / costs[i], reverse=True)
+    keep, used = set(), 0
+    for i in order:
+        if used + costs[i] <= budget:
+            keep.add(i)
+            used += costs[i]
+    return [items[i] for i in sorted(keep)], used
+
+
+def chunk_by_tokens(items: list, cost, budget: int, max_items: int = 0) -> list[tuple[list, int]]:
+    """Consecutive (chunk, tokens) runs of at most `budget` tokens (and `max_items`
+    items when > 0). An item over budget on its own gets a chunk to itself."""
+    chunks, chunk, used = [], [], 0
+    for item in items:
+        c = cost(item)
+        if chunk and (used + c > budget or (max_items and len(chunk) >= max_items)):
+            chunks.append((chunk, used))
+            chunk, used = [], 0
+        chunk.append(item)
+        used += c
+    if chunk:
+        chunks.append((chunk, used))
+    return chunks
+
+
+def usage(label: str, used: int, budget: int, kept: int, total: int) -> str:
+    return f"{label}: {used:,}/{budget:,} tokens ({used / budget:.0%}) · {kept}/{total} items"
@@ -2,7 +2,9 @@
 """
 Business Idea Scout — Multi-Agent System
 =========================================
-Four agents running in sequence via LangChain + Claude:
+Four agents via LangChain + Claude. The first three are overlapped through
+asyncio queues: posts are extracted as each subreddit lands and ideas are
+scored (and printed) as each extractor call returns.
 
   Agent 1 · Reddit Scraper   — fetches top posts from business/startup subreddits
   Agent 2 · Idea Extractor   — extracts concrete, actionable business ideas from raw posts
@@ -14,31 +16,78 @@ Usage:
     python business-ideas/reddit_scout.py --subs entrepreneur SideProject passive_income
     python business-ideas/reddit_scout.py --timeframe month --limit 50 --save
     python business-ideas/reddit_scout.py --fast   # skip LLM, just dump raw Reddit posts
+    python business-ideas/reddit_scout.py --no-cache   # re-ask Claude instead of replaying cached replies
 """
 
 import argparse
+import asyncio
 import json
 import sys
 import warnings
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import requests
-from dotenv import load_dotenv
-from langchain_anthropic import ChatAnthropic
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
+import httpx
+
+from llm_cache import LLMCache, cache_key
+from packing import chunk_by_tokens, estimate_tokens, pack, trim_to_tokens, usage
+
+# LangChain, dotenv and the NumPy-backed dedupe module are imported where the
+# LLM agents run, so --fast and --help don't pay for them at startup
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
+
+    from dedupe import LSHIndex
 
 warnings.filterwarnings("ignore")
-load_dotenv()
 
 HERE = Path(__file__).parent
 PROFILE_FILE = HERE / "profile.md"
 REPORTS_DIR = HERE / "reports"
 REPORTS_DIR.mkdir(exist_ok=True)
+CACHE_FILE = HERE / ".cache" / "llm.sqlite"
+
+# Shared reply cache — set by configure_cache(); None means always call the model
+LLM_CACHE: LLMCache | None = None
 
 REDDIT_HEADERS = {"User-Agent": "Mozilla/5.0 (BusinessScout/1.0; personal-research)"}
 
+# Scraper limits
+SCRAPE_CONCURRENCY = 8      # subreddits in flight (also the connection pool size)
+HOST_CONCURRENCY   = 4      # open requests per host
+HOST_INTERVAL      = 0.2    # seconds between request starts to one host
+PAGE_TIMEOUT       = 12.0   # per-page budget, queueing included
+PAGE_SIZE          = 100    # Reddit's maximum listing page
+BODY_CHARS         = 4000   # post body kept in memory; prompts trim further by tokens
+
+# Token budgets (packing.estimate_tokens) — what each agent's prompt may carry
+POST_MAX_TOKENS      = 300       # one post's header + title + body
+EXTRACT_RUN_BUDGET   = 150_000   # all posts sent to the extractor in one run
+EXTRACT_CALL_BUDGET  = 6_000     # posts per extractor call
+SCORE_CALL_BUDGET    = 2_500     # idea JSON per scorer call
+REPORT_BUDGET        = 12_000    # scored idea JSON sent to the report writer
+PROFILE_BUDGET       = 800       # profile summary sent to the report writer
+
+# Extraction map-reduce
+EXTRACT_CONCURRENCY = 4     # extractor calls in flight
+
+# Near-duplicate filter (estimated Jaccard over word shingles)
+POST_SIMILARITY = 0.5       # title + body, 3-word shingles
+IDEA_SIMILARITY = 0.5       # name + description, 2-word shingles
+
+# Batched scorer
+SCORE_BATCH       = 8       # ideas per scorer call at most (bounds the reply size)
+SCORE_CONCURRENCY = 3       # scorer calls in flight
+
+# Model per agent: a fast one for the many extract / score calls, a larger one for the report
+AGENT_MODELS = {
+    "extract": "claude-haiku-4-5-20251001",
+    "score":   "claude-haiku-4-5-20251001",
+    "report":  "claude-sonnet-4-6",
+}
+
 # ── Subreddit universe ────────────────────────────────────────────────────────
 DEFAULT_SUBS = [
     "entrepreneur",
@@ -53,59 +102,281 @@ DEFAULT_SUBS = [
     "learnprogramming",
     "datascience",
     "marketing",
-    "Entrepreneur",
     "microsaas",
     "indiehackers",
 ]
 
 # ── Agent 1: Reddit Scraper ───────────────────────────────────────────────────
 
-def fetch_subreddit(subreddit: str, limit: int, timeframe: str) -> list[dict]:
-    """Pull top posts from a subreddit via public Reddit JSON API (no auth needed)."""
+class HostThrottle:
+    """Per-host politeness: a cap on open requests plus a minimum gap between request starts."""
+
+    def __init__(self, concurrency: int = HOST_CONCURRENCY, interval: float = HOST_INTERVAL):
+        self.concurrency = concurrency
+        self.interval = interval
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._next_start: dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        sem = self._slots.setdefault(host, asyncio.Semaphore(self.concurrency))
+        async with sem:
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.interval
+            await asyncio.sleep(start - now)
+            yield
+
+
+def normalize_subs(subreddits: list[str]) -> list[str]:
+    """Drop r/ prefixes and case-insensitive repeats, keeping the first spelling."""
+    seen = {}
+    for sub in subreddits:
+        sub = sub.strip().removeprefix("/").removeprefix("r/").strip("/")
+        if sub:
+            seen.setdefault(sub.lower(), sub)
+    return list(seen.values())
+
+
+def engagement(post: dict) -> int:
+    return post["score"] + post["comments"] * 2
+
+
+def post_order(post: dict) -> tuple[int, str]:
+    """Sort key: most engaged first, ties by ID, so the pick never depends on arrival order."""
+    return -engagement(post), post["id"]
+
+
+def dedupe_posts(posts: list[dict]) -> list[dict]:
+    """Reworded reposts collapse into their most engaged copy."""
+    from dedupe import dedupe
+
+    return dedupe(posts, lambda p: f"{p['title']} {p['body']}", engagement,
+                  POST_SIMILARITY, k=3)
+
+
+def parse_posts(payload: dict, subreddit: str) -> list[dict]:
+    """Non-stickied posts from a top.json listing page."""
+    results = []
+    for p in payload["data"]["children"]:
+        d = p["data"]
+        if d.get("stickied"):
+            continue
+        results.append({
+            "id":           d.get("name") or d.get("id"),
+            "crosspost_of": d.get("crosspost_parent"),
+            "title":        d["title"],
+            "score":        d["score"],
+            "comments":     d["num_comments"],
+            "subreddit":    subreddit,
+            "url":          f"https://reddit.com{d.get('permalink', '')}",
+            "body":         (d.get("selftext") or "")[:BODY_CHARS].strip(),
+        })
+    return results
+
+
+async def fetch_page(client: httpx.AsyncClient, throttle: HostThrottle, url: str, params: dict) -> dict:
+    async with throttle.slot(httpx.URL(url).host):
+        r = await client.get(url, params=params)
+    r.raise_for_status()
+    return r.json()
+
+
+async def fetch_subreddit(client: httpx.AsyncClient, throttle: HostThrottle,
+                          subreddit: str, limit: int, timeframe: str):
+    """
+    Yield pages of top posts from a subreddit via the public Reddit JSON API
+    (no auth needed), following the `after` cursor until `limit` posts have
+    been listed or the listing runs out.
+    """
     url = f"https://www.reddit.com/r/{subreddit}/top.json"
-    try:
-        r = requests.get(
-            url,
-            headers=REDDIT_HEADERS,
-            params={"t": timeframe, "limit": limit},
-            timeout=12,
-        )
-        r.raise_for_status()
-        posts = r.json()["data"]["children"]
-        results = []
-        for p in posts:
-            d = p["data"]
-            if d.get("stickied"):
-                continue
-            results.append({
-                "title":        d["title"],
-                "score":        d["score"],
-                "comments":     d["num_comments"],
-                "subreddit":    subreddit,
-                "url":          f"https://reddit.com{d.get('permalink', '')}",
-                "body":         (d.get("selftext") or "")[:600].strip(),
-            })
-        return results
-    except Exception as e:
-        print(f"  ⚠  r/{subreddit}: {e}")
-        return []
+    after, listed = None, 0
+    while listed < limit:
+        params = {"t": timeframe, "limit": min(PAGE_SIZE, limit - listed), "raw_json": 1}
+        if after:
+            params["after"] = after
+        payload = await asyncio.wait_for(fetch_page(client, throttle, url, params), PAGE_TIMEOUT)
+        children = payload["data"]["children"]
+        listed += len(children)
+        yield parse_posts(payload, subreddit)
+        after = payload["data"].get("after")
+        if not after or not children:
+            break
+
+
+async def scrape_reddit_async(subreddits: list[str], limit: int, timeframe: str,
+                              out: asyncio.Queue | None = None) -> list[dict]:
+    """
+    Fetch every subreddit concurrently over one pooled keep-alive client.
+    Each page gets PAGE_TIMEOUT seconds; a slow or failing subreddit is logged
+    and keeps the pages it already delivered, without holding up the rest.
+
+    Pages are folded into one dict keyed by post ID as they arrive, so memory
+    grows with unique posts only. A crosspost shares its parent's key; of the
+    copies, the one with the most engagement is kept.
+
+    With `out`, each finished subreddit's own posts are put on the queue (most
+    engaged first) so extraction can start before the rest land. Crossposts
+    are held back: a parent listed in its own subreddit already goes out with
+    that batch, and the rest follow as one last batch (the most engaged copy
+    of each) once every subreddit is in. Which batch a post lands in never
+    depends on which subreddit answered first.
+    """
+    throttle = HostThrottle()
+    gate = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+    limits = httpx.Limits(max_connections=SCRAPE_CONCURRENCY,
+                          max_keepalive_connections=SCRAPE_CONCURRENCY)
+
+    unique: dict[str, dict] = {}
+    held: dict[str, dict] = {}     # crossposts by parent ID, until every subreddit is in
+    originals: set[str] = set()    # IDs already sent in their own subreddit's batch
+
+    async with httpx.AsyncClient(headers=REDDIT_HEADERS, limits=limits, timeout=PAGE_TIMEOUT,
+                                 follow_redirects=True) as client:
+
+        def keep(seen: dict[str, dict], post: dict):
+            key = post["crosspost_of"] or post["id"]
+            if key not in seen or post_order(post) < post_order(seen[key]):
+                seen[key] = post
+
+        async def one(sub: str) -> tuple[str, int]:
+            n, mine = 0, {}
+            async with gate:
+                try:
+                    async for page in fetch_subreddit(client, throttle, sub, limit, timeframe):
+                        n += len(page)
+                        for post in page:
+                            keep(unique, post)
+                            keep(held if post["crosspost_of"] else mine, post)
+                except asyncio.TimeoutError:
+                    print(f"  ⚠  r/{sub}: timed out after {PAGE_TIMEOUT:g}s")
+                except Exception as e:
+                    print(f"  ⚠  r/{sub}: {e}")
+            originals.update(mine)
+            if out is not None and mine:
+                await out.put(sorted(mine.values(), key=post_order))
+            return sub, n
+
+        for done in asyncio.as_completed([one(sub) for sub in normalize_subs(subreddits)]):
+            sub, n = await done
+            print(f"  r/{sub:<24} → {n} posts")
+    orphans = [post for key, post in held.items() if key not in originals]
+    if out is not None and orphans:
+        await out.put(sorted(orphans, key=post_order))
+    return list(unique.values())
 
 
 def scrape_reddit(subreddits: list[str], limit: int, timeframe: str) -> list[dict]:
     """Agent 1: Collect posts across all target subreddits."""
-    all_posts = []
-    for sub in subreddits:
-        posts = fetch_subreddit(sub, limit, timeframe)
-        all_posts.extend(posts)
-        print(f"  r/{sub:<24} → {len(posts)} posts")
+    all_posts = asyncio.run(scrape_reddit_async(subreddits, limit, timeframe))
     # Sort by engagement (score + comments)
-    all_posts.sort(key=lambda p: p["score"] + p["comments"] * 2, reverse=True)
-    return all_posts[:200]  # cap to avoid token blowout
+    all_posts.sort(key=engagement, reverse=True)
+    return all_posts
+
+
+# ── LLM plumbing ──────────────────────────────────────────────────────────────
+
+def build_chain(messages: list[tuple[str, str]], llm: "ChatAnthropic"):
+    """(role, template) `messages` → chat prompt | llm | text."""
+    from langchain_core.output_parsers import StrOutputParser
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate.from_messages(messages) | llm | StrOutputParser()
+
+
+def configure_cache(path: Path = CACHE_FILE, enabled: bool = True):
+    global LLM_CACHE
+    LLM_CACHE = LLMCache(path) if enabled else None
+
+
+def run_prompt(messages: list[tuple[str, str]], llm: "ChatAnthropic", inputs: dict,
+               valid=bool) -> str:
+    """Render `messages` as a chat prompt, run it through `llm`, return the text.
+    Replies are cached only when `valid(reply)` holds."""
+    key = cache_key(messages, inputs, llm) if LLM_CACHE else None
+    if key and (reply := LLM_CACHE.get(key)) is not None:
+        return reply
+    reply = build_chain(messages, llm).invoke(inputs)
+    if key and valid(reply):
+        LLM_CACHE.put(key, reply)
+    return reply
+
+
+async def run_prompt_async(messages: list[tuple[str, str]], llm: "ChatAnthropic", inputs: dict,
+                           valid=bool) -> str:
+    """run_prompt() over `ainvoke`, so calls can overlap on the event loop."""
+    key = cache_key(messages, inputs, llm) if LLM_CACHE else None
+    if key and (reply := LLM_CACHE.get(key)) is not None:
+        return reply
+    reply = await build_chain(messages, llm).ainvoke(inputs)
+    if key and valid(reply):
+        LLM_CACHE.put(key, reply)
+    return reply
+
+
+async def stream_prompt(messages: list[tuple[str, str]], llm: "ChatAnthropic", inputs: dict,
+                        valid=bool):
+    """Yield the reply text as it streams (`astream`); a cached reply comes as one piece."""
+    key = cache_key(messages, inputs, llm) if LLM_CACHE else None
+    if key and (reply := LLM_CACHE.get(key)) is not None:
+        yield reply
+        return
+    reply = ""
+    async for piece in build_chain(messages, llm).astream(inputs):
+        reply += piece
+        yield piece
+    if key and valid(reply):
+        LLM_CACHE.put(key, reply)
+
+
+_DECODER = json.JSONDecoder()
+
+
+def complete_objects(text: str, pos: int = 0) -> tuple[list[dict], int]:
+    """
+    Objects of a JSON array that are complete in the partial reply `text`,
+    reading from `pos`. Returns them plus the position to resume from once
+    more text has arrived.
+    """
+    objs = []
+    if pos == 0:
+        start = text.find("[")
+        if start < 0:
+            return objs, 0
+        pos = start + 1
+    while True:
+        while pos < len(text) and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(text) or text[pos] != "{":
+            return objs, pos
+        try:
+            obj, end = _DECODER.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            return objs, pos
+        objs.append(obj)
+        pos = end
+
+
+def parse_json_array(raw: str) -> list | None:
+    """The JSON array in an LLM reply (markdown code fences allowed), or None."""
+    try:
+        if "```" in raw:
+            raw = raw.split("```")[1]
+            if raw.startswith("json"):
+                raw = raw[4:]
+        parsed = json.loads(raw.strip())
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, list) else None
+
+
+def is_json_array(raw: str) -> bool:
+    return parse_json_array(raw) is not None
 
 
 # ── Agent 2: Idea Extractor ───────────────────────────────────────────────────
 
-EXTRACTOR_PROMPT = ChatPromptTemplate.from_messages([
+EXTRACTOR_PROMPT = [
     ("system", """You are a sharp business analyst who extracts concrete, actionable business ideas
 from Reddit posts. Focus only on ideas that could realistically generate income — not vague
 discussions or questions.
@@ -117,46 +388,86 @@ For each distinct idea you identify, output a JSON object with:
   - "signals": why Reddit thinks this is promising (upvotes, comments, demand signals)
   - "source_sub": which subreddit it came from
 
-Output a JSON array of ideas. Extract 15–25 ideas. Skip redundant ones. Be specific, not generic.
+Output a JSON array of ideas. Extract up to {max_ideas} ideas. Skip redundant ones. Be specific, not generic.
 """),
-    ("human", """Here are the top Reddit posts from business/startup communities this week:
+    ("human", """Here is a batch of top Reddit posts from business/startup communities:
 
 {posts_text}
 
 Extract the most promising, concrete business ideas from these posts."""),
-])
+]
 
 
-def extract_ideas(posts: list[dict], llm: ChatAnthropic) -> list[dict]:
-    """Agent 2: Use Claude to extract business ideas from raw Reddit posts."""
-    # Format posts for the prompt
-    posts_text = ""
-    for i, p in enumerate(posts[:80], 1):  # top 80 to stay within context
-        posts_text += f"\n[{i}] r/{p['subreddit']} | ↑{p['score']} | 💬{p['comments']}\n"
-        posts_text += f"Title: {p['title']}\n"
-        if p["body"]:
-            posts_text += f"Body: {p['body']}\n"
+def format_post(p: dict, i: int) -> str:
+    similar = f" | ≈{p['similar']} similar posts" if p.get("similar") else ""
+    text = f"\n[{i}] r/{p['subreddit']} | ↑{p['score']} | 💬{p['comments']}{similar}\nTitle: {p['title']}\n"
+    if p["body"]:
+        text += f"Body: {trim_to_tokens(p['body'], POST_MAX_TOKENS - estimate_tokens(text))}\n"
+    return text
 
-    chain = EXTRACTOR_PROMPT | llm | StrOutputParser()
-    raw = chain.invoke({"posts_text": posts_text})
 
-    # Parse JSON from response (handle markdown code blocks)
-    try:
-        if "```" in raw:
-            raw = raw.split("```")[1]
-            if raw.startswith("json"):
-                raw = raw[4:]
-        ideas = json.loads(raw.strip())
-        return ideas if isinstance(ideas, list) else []
-    except json.JSONDecodeError:
-        print("  ⚠  Extractor: could not parse JSON — returning raw text")
-        return [{"idea": "Parse error", "description": raw[:200], "category": "Other",
-                 "signals": "", "source_sub": ""}]
+def format_posts(posts: list[dict], start: int = 1) -> str:
+    return "".join(format_post(p, i) for i, p in enumerate(posts, start))
+
+
+def post_tokens(post: dict) -> int:
+    return estimate_tokens(format_post(post, 999))
+
+
+def pack_posts(posts: list[dict], budget: int) -> tuple[list[dict], int]:
+    """The posts worth the most engagement per token that fit `budget`."""
+    return pack(posts, post_tokens, lambda p: engagement(p) + 1, budget)
+
+
+def extractor_calls(posts: list[dict]) -> list[tuple[list[dict], int, int]]:
+    """(chunk, first post number, tokens) for each extractor call over `posts`."""
+    calls, start = [], 1
+    for chunk, used in chunk_by_tokens(posts, post_tokens, EXTRACT_CALL_BUDGET):
+        calls.append((chunk, start, used))
+        start += len(chunk)
+    return calls
+
+
+def idea_key(idea: dict) -> str:
+    return " ".join("".join(c for c in str(idea.get("idea", "")).lower() if c.isalnum() or c.isspace()).split())
+
+
+def fold_idea(merged: dict[str, dict], idea: dict) -> dict | None:
+    """Add `idea` to `merged` (keyed by idea_key); returns it if new, None if folded into an earlier one."""
+    if not isinstance(idea, dict):
+        return None
+    key = idea_key(idea)
+    if key not in merged:
+        merged[key] = dict(idea)
+        return merged[key]
+    kept = merged[key]
+    for field in ("source_sub", "signals"):
+        parts = [x for x in (kept.get(field), idea.get(field)) if x]
+        if len(parts) == 2 and parts[1] not in parts[0]:
+            kept[field] = f"{parts[0]}; {parts[1]}"
+    return None
+
+
+def idea_weight(idea: dict) -> int:
+    sources = [s for s in str(idea.get("source_sub") or "").split(";") if s.strip()]
+    return len(sources) + idea.get("similar", 0)
+
+
+def dedupe_ideas(ideas: list[dict], index: "LSHIndex | None" = None) -> list[dict]:
+    """Near-identical ideas collapse into the one with the most sources behind it."""
+    from dedupe import dedupe
+
+    return dedupe(ideas, lambda i: f"{i.get('idea', '')} {i.get('description', '')}", idea_weight,
+                  IDEA_SIMILARITY, k=2, index=index)
+
+
+def extractor_inputs(chunk: list[dict], start: int) -> dict:
+    return {"posts_text": format_posts(chunk, start=start), "max_ideas": max(5, len(chunk) // 2)}
 
 
 # ── Agent 3: Profile Scorer ───────────────────────────────────────────────────
 
-SCORER_PROMPT = ChatPromptTemplate.from_messages([
+SCORER_PROMPT = [
     ("system", """You are a business advisor helping evaluate startup ideas for a specific person.
 Score each idea strictly and honestly. Do not be optimistic for its own sake — an idea that
 doesn't fit the person should score low.
@@ -190,32 +501,181 @@ Here are the business ideas to score:
 {ideas_json}
 
 Score all ideas and return the full enriched JSON array, sorted by overall_score descending."""),
-])
+]
 
 
-def score_ideas(ideas: list[dict], profile: str, llm: ChatAnthropic) -> list[dict]:
-    """Agent 3: Score each idea against the user's profile using Claude."""
-    chain = SCORER_PROMPT | llm | StrOutputParser()
-    raw = chain.invoke({
-        "profile": profile,
-        "ideas_json": json.dumps(ideas, indent=2),
-    })
+def scorer_inputs(ideas: list[dict], profile: str) -> dict:
+    return {"profile": profile, "ideas_json": json.dumps(ideas, indent=2)}
 
+
+def unscored(batch: list[dict], scored: list[dict]) -> list[dict]:
+    """Ideas of `batch` missing from a short scorer reply (matched by name)."""
+    if len(scored) >= len(batch):
+        return []
+    got = {idea_key(idea) for idea in scored}
+    return [idea for idea in batch if idea_key(idea) not in got]
+
+
+async def stream_scores(ideas: list[dict], profile: str, llm: "ChatAnthropic"):
+    """Score one batch, yielding each idea as soon as its JSON object is complete.
+    Ideas the reply never covered are yielded unscored at the end."""
+    text, pos, got = "", 0, []
     try:
-        if "```" in raw:
-            raw = raw.split("```")[1]
-            if raw.startswith("json"):
-                raw = raw[4:]
-        scored = json.loads(raw.strip())
-        return scored if isinstance(scored, list) else ideas
-    except json.JSONDecodeError:
-        print("  ⚠  Scorer: could not parse JSON — returning unscored ideas")
-        return ideas
+        async for piece in stream_prompt(SCORER_PROMPT, llm, scorer_inputs(ideas, profile), valid=is_json_array):
+            text += piece
+            objs, pos = complete_objects(text, pos)
+            for obj in objs:
+                got.append(obj)
+                yield obj
+    except Exception as e:
+        print(f"  ⚠  Scorer: {e}")
+    missing = unscored(ideas, got)
+    if missing:
+        print(f"  ⚠  Scorer: no scores for {len(missing)} of {len(ideas)} ideas — keeping them unscored")
+        for idea in missing:
+            yield idea
+
+
+def idea_tokens(idea: dict) -> int:
+    return estimate_tokens(json.dumps(idea, indent=2))
+
+
+def scorer_calls(ideas: list[dict]) -> list[tuple[list[dict], int]]:
+    """(batch, tokens) per scorer call: SCORE_CALL_BUDGET of idea JSON, SCORE_BATCH ideas at most."""
+    return chunk_by_tokens(ideas, idea_tokens, SCORE_CALL_BUDGET, max_items=SCORE_BATCH)
+
+
+def idea_score(idea: dict) -> float:
+    try:
+        return float(idea.get("overall_score", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# ── Streaming pipeline ────────────────────────────────────────────────────────
+#
+#   scrape ──posts_q──▶ extract (EXTRACT_CALL_BUDGET/call) ──ideas_q──▶ score (SCORE_CALL_BUDGET/call)
+#
+# Post batches are fixed by the scraper (one subreddit's own posts, then the
+# crossposts whose parent no batch carried) and deduplicated on their own, so
+# extractor prompts don't depend on which subreddit answered first and a
+# re-run hits the LLM cache. Ideas are folded into everything already sent to
+# the scorer before they go on ideas_q, so no idea is scored twice; a scorer
+# batch can therefore vary with extractor timing. A None on a queue ends the
+# stage.
+
+async def extract_stage(posts_q: asyncio.Queue, ideas_q: asyncio.Queue, llm: "ChatAnthropic",
+                        sub_budget: int) -> list[dict]:
+    """Each batch's posts are deduplicated and packed into `sub_budget` tokens, then split into calls."""
+    from dedupe import LSHIndex
+
+    gate = asyncio.Semaphore(EXTRACT_CONCURRENCY)
+    merged: dict[str, dict] = {}
+    idea_index = LSHIndex(IDEA_SIMILARITY, k=2)
+    kept, tasks = [], []
+    seen = sent = spent = similar_posts = similar_ideas = 0
+
+    async def run(chunk: list[dict], start: int, tokens: int):
+        nonlocal similar_ideas
+        subs = {p["subreddit"] for p in chunk}
+        where = f"r/{subs.pop()}" if len(subs) == 1 else "crossposts"
+        label = f"{where} posts {start}–{start + len(chunk) - 1} ({tokens:,} tok)"
+        async with gate:
+            try:
+                raw = await run_prompt_async(EXTRACTOR_PROMPT, llm, extractor_inputs(chunk, start),
+                                             valid=is_json_array)
+            except Exception as e:
+                raw = e
+        ideas = None if isinstance(raw, Exception) else parse_json_array(raw)
+        if ideas is None:
+            why = raw if isinstance(raw, Exception) else "could not parse JSON"
+            print(f"  ⚠  Extractor {label}: {why} — skipped")
+            return
+        new = [idea for idea in (fold_idea(merged, i) for i in ideas) if idea is not None]
+        new = dedupe_ideas(new, idea_index)
+        similar_ideas += len(ideas) - len(new)
+        kept.extend(new)
+        print(f"  ✎  {label} → {len(new)} new ideas")
+        if new:
+            await ideas_q.put(new)
+
+    while (posts := await posts_q.get()) is not None:
+        unique = dedupe_posts(posts)
+        packed, used = pack_posts(unique, sub_budget)
+        similar_posts += len(posts) - len(unique)
+        seen, sent, spent = seen + len(unique), sent + len(packed), spent + used
+        for chunk, start, tokens in extractor_calls(packed):
+            tasks.append(asyncio.create_task(run(chunk, start, tokens)))
+    await asyncio.gather(*tasks)
+    await ideas_q.put(None)
+    if similar_posts or similar_ideas:
+        print(f"  ≈  near-duplicates skipped: {similar_posts} posts, {similar_ideas} ideas")
+    if seen:
+        print(f"  ▤  {usage('Extractor posts', spent, EXTRACT_RUN_BUDGET, sent, seen)}")
+    return kept
+
+
+async def score_stage(ideas_q: asyncio.Queue, profile: str, llm: "ChatAnthropic", on_scored) -> list[dict]:
+    gate = asyncio.Semaphore(SCORE_CONCURRENCY)
+    scored, tasks, sizes = [], [], []
+
+    async def run(batch: list[dict]):
+        async with gate:
+            async for idea in stream_scores(batch, profile, llm):
+                scored.append(idea)
+                on_scored(idea, scored)
+
+    while (ideas := await ideas_q.get()) is not None:
+        for batch, used in scorer_calls(ideas):
+            sizes.append(used)
+            tasks.append(asyncio.create_task(run(batch)))
+    await asyncio.gather(*tasks)
+    if sizes:
+        print(f"  ▤  Scorer ideas: {sum(sizes):,} tokens over {len(sizes)} calls · "
+              f"largest {max(sizes):,}/{SCORE_CALL_BUDGET:,} ({max(sizes) / SCORE_CALL_BUDGET:.0%})")
+    return scored
+
+
+def print_scored(idea: dict, scored: list[dict]):
+    score = idea_score(idea)
+    rank = 1 + sum(idea_score(other) > score for other in scored)
+    print(f"  ★  {score:>5.2f}  {str(idea.get('idea', ''))[:28]:<28}  #{rank} of {len(scored)}")
+
+
+async def run_pipeline(subreddits: list[str], limit: int, timeframe: str, profile: str,
+                       extract_llm: "ChatAnthropic", score_llm: "ChatAnthropic",
+                       ) -> tuple[list[dict], list[dict], list[dict]]:
+    """Agents 1–3 overlapped. Returns (posts, ideas, scored ideas sorted by overall_score)."""
+    posts_q, ideas_q = asyncio.Queue(), asyncio.Queue()
+    loop = asyncio.get_running_loop()
+    started, first = loop.time(), []
+
+    def on_scored(idea: dict, scored: list[dict]):
+        if not first:
+            first.append(loop.time() - started)
+        print_scored(idea, scored)
+
+    async def scrape() -> list[dict]:
+        try:
+            return await scrape_reddit_async(subreddits, limit, timeframe, out=posts_q)
+        finally:
+            await posts_q.put(None)
+
+    sub_budget = EXTRACT_RUN_BUDGET // (len(normalize_subs(subreddits)) + 1)   # + the crosspost batch
+    posts, ideas, scored = await asyncio.gather(
+        scrape(),
+        extract_stage(posts_q, ideas_q, extract_llm, sub_budget),
+        score_stage(ideas_q, profile, score_llm, on_scored),
+    )
+    scored.sort(key=idea_score, reverse=True)
+    if first:
+        print(f"\n  First scored idea after {first[0]:.1f}s · all done after {loop.time() - started:.1f}s")
+    return posts, ideas, scored
 
 
 # ── Agent 4: Report Writer ────────────────────────────────────────────────────
 
-REPORT_PROMPT = ChatPromptTemplate.from_messages([
+REPORT_PROMPT = [
     ("system", """You are writing a concise, actionable business opportunity report.
 Be direct. No fluff. Write for someone who is busy, smart, and wants to act fast.
 
@@ -236,18 +696,22 @@ Scored business ideas (sorted by fit):
 {scored_json}
 
 Write the full opportunity report."""),
-])
+]
 
 
-def write_report(scored_ideas: list[dict], profile: str, llm: ChatAnthropic) -> str:
+def write_report(scored_ideas: list[dict], profile: str, llm: "ChatAnthropic") -> str:
     """Agent 4: Synthesize everything into a clean markdown report."""
     # Summarize profile briefly for context
-    profile_summary = "\n".join(profile.split("\n")[:30])
+    profile_summary = trim_to_tokens(profile, PROFILE_BUDGET)
+
+    # Best ideas per token that fit, still in score order (squared, so one strong idea
+    # outranks two short weak ones)
+    top, used = pack(scored_ideas, idea_tokens, lambda i: idea_score(i) ** 2, REPORT_BUDGET)
+    print(f"  ▤  {usage('Report ideas', used, REPORT_BUDGET, len(top), len(scored_ideas))}")
 
-    chain = REPORT_PROMPT | llm | StrOutputParser()
-    report = chain.invoke({
+    report = run_prompt(REPORT_PROMPT, llm, {
         "profile_summary": profile_summary,
-        "scored_json": json.dumps(scored_ideas[:20], indent=2),  # top 20 scored
+        "scored_json": json.dumps(top, indent=2),
     })
     return report
 
@@ -287,18 +751,23 @@ def print_top_ideas(ideas: list[dict], n: int = 10):
 def main():
     parser = argparse.ArgumentParser(description="Business Idea Scout — multi-agent Reddit + Claude")
     parser.add_argument("--subs",      nargs="+", default=DEFAULT_SUBS,
-                        help="Subreddits to scrape (default: 15 business subs)")
+                        help="Subreddits to scrape (default: 14 business subs)")
     parser.add_argument("--timeframe", default="week",
                         choices=["day", "week", "month", "year"],
                         help="Reddit timeframe for top posts (default: week)")
     parser.add_argument("--limit",     type=int, default=25,
-                        help="Posts per subreddit (default: 25)")
+                        help="Posts per subreddit, paged 100 at a time (default: 25)")
     parser.add_argument("--save",      action="store_true",
                         help="Save markdown report to reports/ directory")
     parser.add_argument("--fast",      action="store_true",
                         help="Skip LLM agents — just print raw Reddit posts")
-    parser.add_argument("--model",     default="claude-sonnet-4-6",
-                        help="Claude model to use (default: claude-sonnet-4-6)")
+    parser.add_argument("--model",
+                        help="Claude model for every agent (default: per agent, see below)")
+    for agent, model in AGENT_MODELS.items():
+        parser.add_argument(f"--{agent}-model", metavar="MODEL",
+                            help=f"Claude model for the {agent} agent (default: {model})")
+    parser.add_argument("--no-cache",  action="store_true",
+                        help="Always call Claude instead of replaying cached replies")
     args = parser.parse_args()
 
     # Load profile
@@ -307,51 +776,45 @@ def main():
         sys.exit(1)
     profile = PROFILE_FILE.read_text()
 
-    # ── Agent 1: Scrape Reddit ──────────────────────────────────────────────
-    print_section(f"AGENT 1 · REDDIT SCRAPER  (timeframe={args.timeframe})")
-    posts = scrape_reddit(args.subs, args.limit, args.timeframe)
-    print(f"\n  Total posts collected: {len(posts)}")
-
     if args.fast:
+        print_section(f"AGENT 1 · REDDIT SCRAPER  (timeframe={args.timeframe})")
+        posts = scrape_reddit(args.subs, args.limit, args.timeframe)
+        print(f"\n  Total posts collected: {len(posts)}")
         for p in posts[:20]:
             print(f"\n  [{p['subreddit']}] ↑{p['score']} — {p['title']}")
         return
 
     # ── Init LLM ───────────────────────────────────────────────────────────
-    llm = ChatAnthropic(model=args.model, temperature=0.2, max_tokens=4096)
-
-    # ── Agent 2: Extract Ideas ─────────────────────────────────────────────
-    print_section("AGENT 2 · IDEA EXTRACTOR")
-    print("  Extracting business ideas from posts via Claude...", end="", flush=True)
-    ideas = extract_ideas(posts, llm)
-    print(f" found {len(ideas)} ideas.")
+    from dotenv import load_dotenv
+    from langchain_anthropic import ChatAnthropic
+
+    load_dotenv()
+    clients, llms = {}, {}
+    for agent, default in AGENT_MODELS.items():
+        model = getattr(args, f"{agent}_model") or args.model or default
+        if model not in clients:
+            clients[model] = ChatAnthropic(model=model, temperature=0.2, max_tokens=4096)
+        llms[agent] = clients[model]
+    configure_cache(enabled=not args.no_cache)
+
+    # ── Agents 1–3: Scrape → Extract → Score, streamed ─────────────────────
+    print_section(f"AGENTS 1–3 · SCRAPE → EXTRACT → SCORE  (timeframe={args.timeframe})")
+    posts, ideas, scored_ideas = asyncio.run(
+        run_pipeline(args.subs, args.limit, args.timeframe, profile, llms["extract"], llms["score"]))
+    print(f"  Posts: {len(posts)} · ideas: {len(ideas)} · scored: {len(scored_ideas)}")
 
     if not ideas:
         print("  No ideas extracted. Try --fast or check API key.")
         return
 
-    # ── Agent 3: Score Against Profile ────────────────────────────────────
-    print_section("AGENT 3 · PROFILE SCORER")
-    print("  Scoring ideas against your profile...", end="", flush=True)
-    scored_ideas = score_ideas(ideas, profile, llm)
-    print(f" done.")
-
-    # Sort by score
-    def get_score(x):
-        s = x.get("overall_score", 0)
-        try:
-            return float(s)
-        except Exception:
-            return 0
-    scored_ideas.sort(key=get_score, reverse=True)
-
+    print_section("AGENT 3 · RANKED BY PROFILE FIT")
     print_top_ideas(scored_ideas)
 
     # ── Agent 4: Write Report ─────────────────────────────────────────────
     print_section("AGENT 4 · REPORT WRITER")
-    print("  Synthesizing final report...", end="", flush=True)
-    report_md = write_report(scored_ideas, profile, llm)
-    print(" done.")
+    print("  Synthesizing final report...", flush=True)
+    report_md = write_report(scored_ideas, profile, llms["report"])
+    print("  done.")
 
     # Print report to terminal
     print(f"\n{'─'*62}\n")
@@ -364,6 +827,8 @@ def main():
         report_path.write_text(report_md)
         print(f"\n  Report saved → {report_path}")
 
+    if LLM_CACHE:
+        print(f"\n  {LLM_CACHE.summary()}")
     print()
 
 
@@ -10,22 +10,55 @@ Usage:
     python analyzer.py --screen           # Summary + new stock ideas
     python analyzer.py --screen --report  # Also saves report.md
     python analyzer.py --fast             # Skip live enrichment (use CSV values)
+    python analyzer.py --workers 32       # More concurrent yfinance fetches
+    python analyzer.py --offline          # Serve last known values from the cache
+    python analyzer.py --no-cache         # Always hit yfinance live
+    python analyzer.py --no-snapshot      # Don't write this run to snapshots/
+    python analyzer.py --risk             # Add volatility, beta and VaR
+    python analyzer.py --screen --profile # Phase timings + fetch stats → profiles/*.json
+    python analyzer.py --screen --universe sp1500.txt --shards 8   # Screen a full index
+    python analyzer.py --holdings me.csv partner.csv ira.csv --report  # Batch: one fetch, N portfolios
+    python analyzer.py --screen --export --format arrow              # Typed results → export/
+    python analyzer.py --watch 30         # Live dashboard, one bulk quote every 30s
 """
 
 import argparse
+import json
+import math
+import os
+import time
 import warnings
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
+
+from cache import FieldCache
+from export import FORMATS, export_results
+from profiler import PROFILE
+from risk import analyze_risk
+from scheduler import MAX_RATE, MIN_RATE, YAHOO
+from store import save_snapshot
+from watch import WATCH_INTERVAL, watch_portfolio
 
 warnings.filterwarnings("ignore")
 
 HERE = Path(__file__).parent
 HOLDINGS_FILE = HERE / "holdings.csv"
 REPORT_FILE = HERE / "report.md"
+EXPORT_DIR = HERE / "export"
+CACHE_FILE = HERE / ".cache" / "yfinance.sqlite"
+HISTORY_FILE = HERE / ".cache" / "history.arrow"
+
+# Shared field cache — set by configure_cache(); None means always fetch live
+CACHE: FieldCache | None = None
+
+# yfinance is slow to import and unused by --fast / --offline / --help — see load_yfinance()
+yf = None
 
 # ── Screening universe ────────────────────────────────────────────────────────
 # Curated candidates aligned with your investment style:
@@ -54,12 +87,94 @@ SCREEN_UNIVERSE = [
 
 CRYPTO_SUFFIX = "USD"
 
+# ── Fetch engine ──────────────────────────────────────────────────────────────
+FETCH_WORKERS = 16     # concurrent yfinance requests
+FETCH_TIMEOUT = 20.0   # seconds before a single ticker is given up on
+SHARD_SIZE    = 250    # tickers per worker process when auto-sharding large universes
+TOP_N         = 15     # candidates kept by the screener
+SHORTLIST     = 0      # screener names that get a fundamentals fetch; 0 = every priced name (exact)
+
 # ── Data loading ──────────────────────────────────────────────────────────────
 
-def load_holdings() -> pd.DataFrame:
-    df = pd.read_csv(HOLDINGS_FILE)
+# Fixed dtypes skip pandas' type inference on large multi-lot files
+HOLDINGS_DTYPES = {
+    "ticker": str, "value_usd": str, "horizon": str, "sector": str,
+    "type": str, "key_thesis": str, "key_risk": str,
+}
+# Columns summed when several lots of one ticker are collapsed into a position
+LOT_SUM_COLUMNS = ["value_usd", "shares", "quantity", "cost_basis"]
+
+# ── Risk ──────────────────────────────────────────────────────────────────────
+HISTORY_PERIOD = "5y"
+HISTORY_TTL    = 12 * 3600   # seconds before cached daily closes are re-downloaded
+BENCHMARK      = "SPY"
+
+
+def load_holdings(path: Path = None) -> pd.DataFrame:
+    """
+    Load holdings and aggregate tax lots to one row per ticker: additive
+    columns are summed, descriptive ones keep the first lot's value.
+    """
+    df = pd.read_csv(path or HOLDINGS_FILE, dtype=HOLDINGS_DTYPES)
+    df["ticker"] = df["ticker"].str.strip()
     df["value_usd"] = pd.to_numeric(df["value_usd"], errors="coerce").fillna(0)
-    return df
+    return aggregate_lots(df)
+
+
+def aggregate_lots(df: pd.DataFrame) -> pd.DataFrame:
+    """Collapse duplicate tickers into one position (see LOT_SUM_COLUMNS)."""
+    if not df["ticker"].duplicated().any():
+        return df
+
+    df = df.copy()
+    for col in LOT_SUM_COLUMNS[1:]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    agg = {c: "sum" if c in LOT_SUM_COLUMNS else "first" for c in df.columns if c != "ticker"}
+    return df.groupby("ticker", sort=False, as_index=False).agg(agg)
+
+
+def load_portfolios(paths: list[Path]) -> dict[str, pd.DataFrame]:
+    """
+    Load several holdings files, keyed by file stem (parent/stem when two
+    files share a stem).
+    """
+    paths = [Path(p) for p in paths]
+    stems = Counter(p.stem for p in paths)
+    return {(p.stem if stems[p.stem] == 1 else f"{p.parent.name}/{p.stem}"): load_holdings(p)
+            for p in paths}
+
+
+def consolidate(portfolios: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """One position per ticker across every portfolio — the set that gets fetched."""
+    if len(portfolios) == 1:
+        return next(iter(portfolios.values()))
+    return aggregate_lots(pd.concat(portfolios.values(), ignore_index=True))
+
+
+def attach_market_data(df: pd.DataFrame, enriched: pd.DataFrame) -> pd.DataFrame:
+    """Copy the fetched columns of `enriched` (one row per ticker) onto a portfolio's rows."""
+    fetched = ["ticker"] + [c for c in enriched.columns if c not in df.columns]
+    return df.merge(enriched[fetched], on="ticker", how="left")
+
+
+def load_universe(path: Path) -> list[str]:
+    """
+    Load a screening universe from a file: either a CSV with a ticker/symbol
+    column, or plain text with tickers separated by whitespace or commas
+    (`#` starts a comment).
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        df = pd.read_csv(path)
+        col = next((c for c in df.columns if c.lower() in ("ticker", "symbol")), df.columns[0])
+        tickers = df[col].dropna().astype(str).tolist()
+    else:
+        tickers = []
+        for line in path.read_text().splitlines():
+            tickers += line.split("#")[0].replace(",", " ").split()
+    # Yahoo uses '-' for share classes (BRK-B), index files often use '.'
+    return list(dict.fromkeys(t.strip().upper().replace(".", "-") for t in tickers if t.strip()))
 
 
 def is_crypto(ticker: str) -> bool:
@@ -67,7 +182,12 @@ def is_crypto(ticker: str) -> bool:
 
 
 def is_etf(row: pd.Series) -> bool:
-    return row.get("type", "").upper() == "ETF"
+    return str(row.get("type") or "").upper() == "ETF"
+
+
+def needs_fundamentals(row: pd.Series) -> bool:
+    """Only equities need the full .info payload — ETFs and crypto just need a price."""
+    return not is_crypto(row["ticker"]) and not is_etf(row)
 
 
 def safe_get(info: dict, *keys):
@@ -78,11 +198,53 @@ def safe_get(info: dict, *keys):
     return None
 
 
-def fetch_info(ticker: str) -> dict:
+def load_yfinance():
+    """Import yfinance on first use (bench.py swaps in a fake by setting `yf`)."""
+    global yf
+    if yf is None:
+        import yfinance
+        yf = yfinance
+    return yf
+
+
+def configure_cache(path: Path = CACHE_FILE, offline: bool = False, enabled: bool = True):
+    global CACHE
+    CACHE = FieldCache(path, offline=offline) if enabled or offline else None
+
+
+def fetch_info(ticker: str, fresh_price: bool = True) -> dict:
+    """
+    Fetch fundamentals, served from the field cache while every field is
+    within its TTL. Pass fresh_price=False when the price comes from a bulk
+    quote, so a stale cached price alone doesn't trigger a .info refetch.
+    """
+    if CACHE is None:
+        return fetch_info_live(ticker)
+
+    cached, fresh = CACHE.get(ticker, skip=() if fresh_price else ("live_price",))
+    # Quote paths cache a few fields on their own; only a full .info record has a name
+    hit = (fresh and "name" in cached) or CACHE.offline
+    PROFILE.cache_lookup("info", hits=int(hit), misses=int(not hit))
+    if hit:
+        return cached
+    info = fetch_info_live(ticker)
+    if info:
+        CACHE.put(ticker, info)
+        return info
+    return cached   # Yahoo failed — fall back to last known values
+
+
+def fetch_info_live(ticker: str) -> dict:
     """Fetch yfinance info dict with safe fallbacks."""
+    def get_info():
+        # Timed inside the scheduler, so rate-limit waits and retry backoff aren't upstream latency
+        with PROFILE.fetch("info", ticker) as req:
+            info = load_yfinance().Ticker(ticker).info
+            req["empty"] = not info
+            return info
+
     try:
-        t = yf.Ticker(ticker)
-        info = t.info
+        info = YAHOO.call(ticker, get_info)
         price = safe_get(info, "currentPrice", "regularMarketPrice", "ask", "bid")
         return {
             "name":           safe_get(info, "shortName", "longName") or ticker,
@@ -111,43 +273,327 @@ def fetch_info(ticker: str) -> dict:
         return {}
 
 
-def fetch_crypto_price(ticker: str) -> dict:
-    """Fetch current price for a crypto ticker."""
+def fetch_quotes(tickers: list[str]) -> pd.DataFrame:
+    """
+    Fetch last prices for many tickers in a single multi-ticker yf.download.
+    Returns a DataFrame indexed by ticker with a `live_price` column; tickers
+    Yahoo has no data for are simply absent.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    prices, missing = {}, tickers
+    if CACHE is not None:
+        prices, missing = CACHE.get_field(tickers, "live_price")
+        if CACHE.offline:
+            missing = []
+        PROFILE.cache_lookup("quote", hits=len(tickers) - len(missing), misses=len(missing))
+
+    for ticker, price in download_prices(missing).items():
+        prices[ticker] = price
+        if CACHE is not None:
+            CACHE.put(ticker, {"live_price": price})
+
+    last = pd.Series({t: prices[t] for t in tickers if prices.get(t) is not None}, dtype=float)
+    return pd.DataFrame({"live_price": last}).rename_axis("ticker")
+
+
+def download_history(tickers: list[str], period: str,
+                     fields: tuple = ("Close",)) -> dict[str, pd.DataFrame]:
+    """
+    One multi-ticker yf.download → {field: date × ticker frame}.
+    Returns {} when nothing came back.
+    """
+    if not tickers:
+        return {}
+    def download():
+        with PROFILE.fetch("download", f"{period}×{len(tickers)}") as req:
+            hist = load_yfinance().download(tickers, period=period, progress=False, group_by="column")
+            req["empty"] = hist is None or hist.empty
+            return hist
+
     try:
-        hist = yf.download(ticker, period="2d", progress=False)
-        if not hist.empty:
-            return {"live_price": float(hist["Close"].iloc[-1])}
+        hist = YAHOO.call("download", download)
     except Exception:
-        pass
-    return {}
+        return {}
+    if hist is None or hist.empty:
+        return {}
+
+    frames = {}
+    for field in fields:
+        frame = hist[field]
+        if isinstance(frame, pd.Series):
+            frame = frame.to_frame(tickers[0])
+        frames[field] = frame
+    return frames
+
 
+def download_prices(tickers: list[str]) -> pd.Series:
+    """Last close per ticker from one multi-ticker yf.download (empty on failure)."""
+    # 5d + ffill so equities still have a price on weekends next to crypto
+    hist = download_history(tickers, "5d")
+    if not hist:
+        return pd.Series(dtype=float)
+    return hist["Close"].ffill().iloc[-1].dropna().astype(float)
 
-def enrich_holdings(df: pd.DataFrame) -> pd.DataFrame:
+
+def fetch_ranges(tickers: list[str]) -> pd.DataFrame:
+    """
+    Screener stage 1: last price and 52-week high/low for many tickers from a
+    single 1-year multi-ticker download. Returns a frame indexed by ticker
+    with live_price, w52_high and w52_low; tickers with no price are absent.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    fields = ["live_price", "w52_high", "w52_low"]
+    values, missing = {f: {} for f in fields}, tickers
+    if CACHE is not None:
+        stale = set()
+        for f in fields:
+            values[f], stale_f = CACHE.get_field(tickers, f)
+            stale.update(stale_f)
+        missing = [] if CACHE.offline else [t for t in tickers if t in stale]
+        PROFILE.cache_lookup("range", hits=len(tickers) - len(missing), misses=len(missing))
+
+    hist = download_history(missing, "1y", ("Close", "High", "Low"))
+    if hist:
+        live = pd.DataFrame({
+            "live_price": hist["Close"].ffill().iloc[-1],
+            "w52_high":   hist["High"].max(),
+            "w52_low":    hist["Low"].min(),
+        }).dropna(subset=["live_price"])
+        for ticker, row in live.iterrows():
+            row = {f: float(row[f]) for f in fields}
+            for f in fields:
+                values[f][ticker] = row[f]
+            if CACHE is not None:
+                CACHE.put(ticker, row)
+
+    ranges = pd.DataFrame({f: pd.Series(values[f], dtype=float) for f in fields})
+    ranges = ranges.reindex([t for t in tickers if t in ranges.index]).dropna(subset=["live_price"])
+    return ranges.rename_axis("ticker")
+
+
+def read_history() -> tuple[pd.DataFrame, dict]:
+    """HISTORY_FILE as (closes, {ticker: fetched_at}); columns without a fetch time count as stale."""
+    import pyarrow.feather as feather
+
+    table = feather.read_table(HISTORY_FILE)
+    fetched = json.loads((table.schema.metadata or {}).get(b"fetched_at", b"{}"))
+    return table.to_pandas().set_index("date"), fetched
+
+
+def write_history(prices: pd.DataFrame, fetched: dict):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    table = pa.Table.from_pandas(prices.reset_index(), preserve_index=False)
+    meta = {**(table.schema.metadata or {}), b"fetched_at": json.dumps(fetched).encode()}
+    HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    feather.write_feather(table.replace_schema_metadata(meta), HISTORY_FILE)
+
+
+def fetch_price_history(tickers: list[str]) -> pd.DataFrame:
+    """
+    Daily closes (date × ticker) over HISTORY_PERIOD, kept in one Arrow file
+    next to the field cache with each ticker's fetch time in its metadata.
+    Tickers the file doesn't cover, or fetched more than HISTORY_TTL ago, are
+    re-downloaded together in a single multi-ticker request and replace their
+    old columns. Offline, only the file is read.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    prices, fetched, missing = pd.DataFrame(), {}, tickers
+    if CACHE is not None:
+        if HISTORY_FILE.exists():
+            prices, fetched = read_history()
+        now = time.time()
+        missing = [] if CACHE.offline else [
+            t for t in tickers if t not in prices.columns or now - fetched.get(t, 0) > HISTORY_TTL]
+        PROFILE.cache_lookup("history", hits=len(tickers) - len(missing), misses=len(missing))
+
+    hist = download_history(missing, HISTORY_PERIOD)
+    if hist:
+        fresh = hist["Close"].rename_axis(index="date", columns=None).dropna(axis=1, how="all")
+        now = time.time()
+        fetched.update({t: now for t in fresh.columns})
+        if not prices.empty:
+            fresh = fresh.combine_first(prices.drop(columns=fresh.columns, errors="ignore"))
+        prices = fresh
+        if CACHE is not None:
+            write_history(prices, fetched)
+
+    return prices.reindex(columns=[t for t in tickers if t in prices.columns])
+
+
+def quote_price(quotes: pd.DataFrame, ticker: str):
+    if quotes is None or ticker not in quotes.index:
+        return None
+    return float(quotes.at[ticker, "live_price"])
+
+
+def fetch_many(tickers: list[str], fetch=fetch_info, workers: int = FETCH_WORKERS,
+               timeout: float = FETCH_TIMEOUT, on_result=None) -> list[dict]:
+    """
+    Fetch many tickers concurrently on a bounded thread pool.
+
+    Results are returned in the same order as `tickers`. A ticker whose fetch
+    runs longer than `timeout` seconds is given up on and yields `{}`.
+    `on_result(ticker, info)` is called as each ticker finishes (in completion
+    order) — used for progress output.
+    """
+    results = [{} for _ in tickers]
+    if not tickers:
+        return results
+
+    started = {}
+
+    def run(i: int, ticker: str) -> dict:
+        started[i] = time.monotonic()
+        return fetch(ticker)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    futures = {pool.submit(run, i, t): i for i, t in enumerate(tickers)}
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            for f in done:
+                i = futures[f]
+                try:
+                    results[i] = f.result() or {}
+                except Exception:
+                    results[i] = {}
+                if on_result:
+                    on_result(tickers[i], results[i])
+
+            now = time.monotonic()
+            for f in list(pending):
+                i = futures[f]
+                if i in started and now - started[i] > timeout:
+                    pending.discard(f)
+                    if on_result:
+                        on_result(tickers[i], {})
+    finally:
+        # Timed-out fetches can't be interrupted; don't wait for them.
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def _fetch_shard(tickers: list[str], workers: int, timeout: float, cache_path, offline: bool,
+                 rate: float, shards: int) -> tuple[list[dict], Counter, dict]:
+    """
+    Process-pool entry point: fetch one shard of the universe on its own
+    thread pool. Returns the infos plus this process's failure counts and
+    profiler state.
+    """
+    configure_cache(cache_path, offline=offline, enabled=cache_path is not None)
+    # Each shard's AIMD tops out at its share, so together they never exceed MAX_RATE
+    YAHOO.rate = rate / shards
+    YAHOO.min_rate = MIN_RATE / shards
+    YAHOO.max_rate = MAX_RATE / shards
+    # Forked workers inherit the parent's counters; report only this shard's
+    YAHOO.failures = Counter()
+    PROFILE.reset()
+    infos = fetch_many(tickers, partial(fetch_info, fresh_price=False), workers, timeout,
+                       on_result=screen_progress)
+    return infos, YAHOO.failures, PROFILE.state()
+
+
+def fetch_sharded(tickers: list[str], shards: int = 0, workers: int = FETCH_WORKERS,
+                  timeout: float = FETCH_TIMEOUT) -> list[dict]:
+    """
+    Fetch fundamentals for a large universe, sharded across worker processes
+    (each running its own thread pool). shards=0 picks one process per
+    SHARD_SIZE tickers, capped at the CPU count. Results keep input order.
+    """
+    if shards <= 0:
+        shards = min(os.cpu_count() or 1, math.ceil(len(tickers) / SHARD_SIZE))
+    if shards <= 1:
+        return fetch_many(tickers, partial(fetch_info, fresh_price=False), workers, timeout,
+                          on_result=screen_progress)
+
+    size = math.ceil(len(tickers) / shards)
+    chunks = [tickers[i:i + size] for i in range(0, len(tickers), size)]
+    cache_path = CACHE.path if CACHE is not None else None
+    offline = CACHE is not None and CACHE.offline
+    infos = []
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        # Shards share Yahoo's tolerance, not multiply it: each gets 1/len(chunks) of the rate
+        futures = [pool.submit(_fetch_shard, c, workers, timeout, cache_path, offline,
+                               YAHOO.rate, len(chunks)) for c in chunks]
+        for f in futures:
+            shard_infos, failures, profile = f.result()
+            infos += shard_infos
+            YAHOO.failures.update(failures)
+            PROFILE.merge(profile)
+    return infos
+
+
+def enrich_holdings(df: pd.DataFrame, workers: int = FETCH_WORKERS,
+                    timeout: float = FETCH_TIMEOUT, quotes: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Prices for every holding come from one bulk quote download; the per-ticker
+    .info call is only made for equities, which need fundamentals.
+    """
     print("  Fetching live data for holdings", end="", flush=True)
+    if quotes is None:
+        quotes = fetch_quotes(df["ticker"].tolist())
+
+    needs_info = [needs_fundamentals(row) for _, row in df.iterrows()]
+    print("." * (len(df) - sum(needs_info)), end="", flush=True)
+    info_tickers = df.loc[needs_info, "ticker"].tolist()
+    infos = dict(zip(info_tickers, fetch_many(
+        info_tickers, partial(fetch_info, fresh_price=False), workers, timeout,
+        on_result=lambda t, info: print(".", end="", flush=True),
+    )))
+    print(" done.")
+
     enriched = []
     for _, row in df.iterrows():
         ticker = row["ticker"]
-        if is_crypto(ticker):
-            extra = fetch_crypto_price(ticker)
-        else:
-            extra = fetch_info(ticker)
+        extra = dict(infos.get(ticker, {}))
+        price = quote_price(quotes, ticker)
+        if price is not None:
+            extra["live_price"] = price
         enriched.append({**row.to_dict(), **extra})
-        print(".", end="", flush=True)
-    print(" done.")
     return pd.DataFrame(enriched)
 
 
 # ── Portfolio display ─────────────────────────────────────────────────────────
 
+def fmt_col(values: pd.Series, spec: str, na: str = "N/A", valid: pd.Series = None) -> pd.Series:
+    """
+    Format a whole column with `spec` in one pass — `na` where `valid` is False
+    (default: where the value is missing).
+    """
+    valid = values.notna() if valid is None else valid
+    out = pd.Series(na, index=values.index, dtype=object)
+    if valid.any():
+        out[valid] = values[valid].map(spec.format)
+    return out
+
+
+def num_col(df: pd.DataFrame, col: str) -> pd.Series:
+    """Numeric view of an optional column (all-NaN when absent)."""
+    if col not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[col], errors="coerce")
+
+
+def text_col(df: pd.DataFrame, col: str, na: str = "") -> pd.Series:
+    """String view of an optional column with missing/empty values replaced by `na`."""
+    if col not in df.columns:
+        return pd.Series(na, index=df.index, dtype=object)
+    text = df[col].astype(object).where(df[col].notna(), "").astype(str)
+    return text.where(text != "", na)
+
+
 def print_header(title: str):
     print(f"\n{'═'*62}")
     print(f"  {title}")
     print(f"{'═'*62}")
 
 
-def portfolio_summary(df: pd.DataFrame):
+def portfolio_summary(df: pd.DataFrame, title: str = "PORTFOLIO SUMMARY"):
     total = df["value_usd"].sum()
-    print_header(f"PORTFOLIO SUMMARY  ·  {datetime.today().strftime('%Y-%m-%d')}")
+    print_header(f"{title}  ·  {datetime.today().strftime('%Y-%m-%d')}")
     print(f"  Total value : ${total:>13,.2f}")
     print(f"  Holdings    : {len(df)}")
 
@@ -169,18 +615,44 @@ def portfolio_summary(df: pd.DataFrame):
         print(f"  {horizon:<22} ${val:>10,.0f}  {pct:>5.1f}%")
 
 
+def allocation(df: pd.DataFrame, col: str) -> pd.DataFrame:
+    """Value, % of total and holding count per `col` value, largest first."""
+    grouped = df.groupby(col)["value_usd"]
+    out = pd.DataFrame({"value_usd": grouped.sum(), "holdings": grouped.size()})
+    out["pct"] = out["value_usd"] / out["value_usd"].sum() * 100
+    return out.sort_values("value_usd", ascending=False).reset_index()
+
+
+def portfolio_breakdown(portfolios: dict[str, pd.DataFrame]):
+    """Value per portfolio as a share of the consolidated total."""
+    totals = pd.Series({name: df["value_usd"].sum() for name, df in portfolios.items()})
+    total = totals.sum()
+    print(f"\n  {'Portfolio':<30} {'Value':>12}  {'%':>6}  Holdings")
+    print(f"  {'─'*62}")
+    counts = pd.Series({name: len(df) for name, df in portfolios.items()})
+    lines = ("  " + fmt_col(pd.Series(totals.index, index=totals.index), "{:<30}")
+             + " $" + fmt_col(totals, "{:>10,.0f}")
+             + "  " + fmt_col(totals / total * 100, "{:>5.1f}")
+             + "%  " + fmt_col(counts, "{:>8}"))
+    print("\n".join(lines))
+
+
 def top_holdings(df: pd.DataFrame, n: int = 10):
     total = df["value_usd"].sum()
     top = df.nlargest(n, "value_usd")
     print(f"\n  Top {n} Holdings:")
     print(f"  {'Ticker':<8} {'Value':>13}  {'%':>6}  {'Horizon':<18}  Sector")
     print(f"  {'─'*70}")
-    for _, r in top.iterrows():
-        pct = r["value_usd"] / total * 100
-        live_note = ""
-        if r.get("live_price"):
-            live_note = f"  @ ${r['live_price']:.2f}"
-        print(f"  {r['ticker']:<8} ${r['value_usd']:>11,.0f}  {pct:>5.1f}%  {r['horizon']:<18}  {r['sector']}{live_note}")
+    if top.empty:
+        return
+    price = num_col(top, "live_price")
+    lines = ("  " + fmt_col(top["ticker"], "{:<8}")
+             + " $" + fmt_col(top["value_usd"], "{:>11,.0f}")
+             + "  " + fmt_col(top["value_usd"] / total * 100, "{:>5.1f}")
+             + "%  " + top["horizon"].astype(str).str.ljust(18)
+             + "  " + top["sector"].astype(str)
+             + fmt_col(price, "  @ ${:.2f}", na="", valid=price.fillna(0) != 0))
+    print("\n".join(lines))
 
 
 def valuation_snapshot(df: pd.DataFrame):
@@ -197,14 +669,75 @@ def valuation_snapshot(df: pd.DataFrame):
     print(f"\n  Valuation Snapshot (equities only):")
     print(f"  {'Ticker':<8} {'Price':>9} {'PE TTM':>8} {'Fwd PE':>8} {'RevGrw':>8} {'GrsMgn':>8}  Analyst")
     print(f"  {'─'*68}")
-    for _, r in display.iterrows():
-        price  = f"${r['live_price']:>8.2f}" if pd.notna(r.get("live_price")) else "       N/A"
-        pe_ttm = f"{r['pe_ttm']:>8.1f}"     if pd.notna(r.get("pe_ttm"))    else "       N/A"
-        fwd_pe = f"{r['fwd_pe']:>8.1f}"     if pd.notna(r.get("fwd_pe"))    else "       N/A"
-        rev_g  = f"{r['rev_growth']*100:>7.1f}%" if pd.notna(r.get("rev_growth")) else "      N/A"
-        gm     = f"{r['gross_margin']*100:>7.1f}%" if pd.notna(r.get("gross_margin")) else "      N/A"
-        analyst = str(r.get("analyst") or "N/A")
-        print(f"  {r['ticker']:<8} {price} {pe_ttm} {fwd_pe} {rev_g} {gm}  {analyst}")
+    lines = ("  " + fmt_col(display["ticker"], "{:<8}")
+             + " " + fmt_col(num_col(display, "live_price"), "${:>8.2f}", "       N/A")
+             + " " + fmt_col(num_col(display, "pe_ttm"), "{:>8.1f}", "       N/A")
+             + " " + fmt_col(num_col(display, "fwd_pe"), "{:>8.1f}", "       N/A")
+             + " " + fmt_col(num_col(display, "rev_growth") * 100, "{:>7.1f}%", "      N/A")
+             + " " + fmt_col(num_col(display, "gross_margin") * 100, "{:>7.1f}%", "      N/A")
+             + "  " + text_col(display, "analyst", "N/A"))
+    print("\n".join(lines))
+
+
+def portfolio_risk(df: pd.DataFrame, prices: pd.DataFrame = None) -> dict:
+    """
+    Risk figures for the holdings from cached daily history (see risk.py).
+    Pass `prices` to reuse one history download across portfolios.
+    """
+    values = df.groupby("ticker", sort=False)["value_usd"].sum()
+    if prices is None:
+        prices = fetch_price_history(values.index.tolist() + [BENCHMARK])
+    return analyze_risk(prices, values, BENCHMARK)
+
+
+def risk_rows(risk: dict, n: int = 10) -> pd.DataFrame:
+    """Largest contributors to portfolio variance, with weight, vol, beta and return count."""
+    rows = pd.DataFrame({
+        "weight":     risk["weights"],
+        "vol":        risk["holding_vol"],
+        "beta":       risk["holding_beta"],
+        "risk_share": risk["risk_share"],
+        "obs":        risk["holding_obs"],
+    }).rename_axis("ticker").reset_index()
+    return rows.sort_values("risk_share", ascending=False).head(n)
+
+
+def short_histories(risk: dict) -> list[str]:
+    """'TICKER (n days)' for holdings with under 3/4 of the window's returns."""
+    obs = risk["holding_obs"]
+    short = obs[obs < 0.75 * risk["days"]].sort_values()
+    return [f"{t} ({n} days)" for t, n in short.items()]
+
+
+def print_risk(risk: dict, title: str = "RISK"):
+    print_header(f"{title}  ·  {HISTORY_PERIOD} daily  ·  vs {risk.get('benchmark', BENCHMARK)}")
+    if not risk:
+        print("  No price history available.")
+        return
+    conf = f"{risk['confidence']:.0%}"
+    beta = f"{risk['beta']:.2f}" if risk["beta"] is not None else "N/A"
+    print(f"  Coverage    : {risk['coverage']:.1%} of value · {risk['days']} days")
+    print(f"  Volatility  : {risk['vol']:.1%} annualized")
+    print(f"  Beta        : {beta}")
+    print(f"  VaR 1d {conf}  : ${risk['var_hist'] * risk['total']:,.0f} ({risk['var_hist']:.2%}) historical"
+          f" · ${risk['var_param'] * risk['total']:,.0f} ({risk['var_param']:.2%}) parametric")
+
+    rows = risk_rows(risk)
+    print(f"\n  {'Ticker':<8} {'Weight':>7} {'Vol':>7} {'Beta':>6} {'RiskShare':>10} {'Days':>6}")
+    print(f"  {'─'*49}")
+    lines = ("  " + fmt_col(rows["ticker"], "{:<8}")
+             + " " + fmt_col(rows["weight"] * 100, "{:>6.1f}%")
+             + " " + fmt_col(rows["vol"] * 100, "{:>6.1f}%")
+             + " " + fmt_col(rows["beta"], "{:>6.2f}", "   N/A")
+             + " " + fmt_col(rows["risk_share"] * 100, "{:>9.1f}%")
+             + " " + fmt_col(rows["obs"], "{:>6}"))
+    print("\n".join(lines))
+
+    if short := short_histories(risk):
+        print("\n  Short history (stats over the days traded only): " + ", ".join(short))
+
+    if risk["top_pairs"]:
+        print("\n  Most correlated: " + "  ".join(f"{a}/{b} {c:.2f}" for a, b, c in risk["top_pairs"]))
 
 
 # ── Stock screener ────────────────────────────────────────────────────────────
@@ -262,28 +795,88 @@ def score_candidate(info: dict) -> float:
     return round(score, 2)
 
 
-def screen_candidates(existing_tickers: set) -> pd.DataFrame:
-    universe = [t for t in SCREEN_UNIVERSE if t not in existing_tickers]
+def momentum_points(price: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """score_candidate part 5, vectorized: 1 pt within 15% of the 52w high, 0.5 within 30%."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct_from_high = np.where(high > 0, price / high, np.nan)
+        return np.select([pct_from_high >= 0.85, pct_from_high >= 0.70], [1.0, 0.5], 0.0)
+
+
+def score_frame(df: pd.DataFrame) -> pd.Series:
+    """
+    Vectorized score_candidate over a columnar frame of candidates —
+    same points and thresholds, one NumPy pass instead of a loop per row.
+    """
+    def col(name: str) -> np.ndarray:
+        if name not in df.columns:
+            return np.full(len(df), np.nan)
+        return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float)
+
+    rg    = np.nan_to_num(col("rev_growth"))
+    fpe   = col("fwd_pe")
+    roe   = col("roe")
+    price = col("live_price")
+    high  = col("w52_high")
+    gm    = col("gross_margin")
+    analyst = (df["analyst"].fillna("").astype(str).str.lower().to_numpy()
+               if "analyst" in df.columns else np.full(len(df), ""))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        score = np.minimum(rg, 0.5) / 0.5 * 3
+        score += np.select([(fpe >= 15) & (fpe <= 45), (fpe > 0) & (fpe <= 70)], [2.0, 1.0], 0.0)
+        score += np.select([roe > 0.25, roe > 0.15], [1.5, 1.0], 0.0)
+        score += np.select([analyst == "strong_buy", analyst == "buy"], [2.0, 1.5], 0.0)
+        score += momentum_points(price, high)
+        score += np.select([gm > 0.60, gm > 0.40], [0.5, 0.25], 0.0)
+
+    return pd.Series(score, index=df.index).round(2)
+
+
+def screen_universe(existing_tickers: set, universe: list[str] = SCREEN_UNIVERSE) -> list[str]:
+    return [t for t in universe if t not in existing_tickers]
+
+
+def screen_progress(ticker: str, info: dict):
+    print("." if info and info.get("live_price") else "·", end="", flush=True)
+
+
+def screen_candidates(existing_tickers: set, workers: int = FETCH_WORKERS,
+                      timeout: float = FETCH_TIMEOUT, universe: list[str] = SCREEN_UNIVERSE,
+                      shards: int = 0, shortlist: int = SHORTLIST) -> pd.DataFrame:
+    """
+    Two-stage screen. Stage 1 prices the whole universe (with 52w range) in
+    one bulk download. Stage 2 fetches .info for the priced names in one
+    sharded pass and scores them, so the top N is exact by default.
+
+    With `shortlist` > 0, stage 1 keeps only the `shortlist` names trading
+    closest to their 52-week high. That cut is lossy: momentum is worth 1 of
+    10 points, so a name far off its high with strong fundamentals can miss it.
+    """
+    universe = screen_universe(existing_tickers, universe)
     print_header(f"SCREENING {len(universe)} CANDIDATES FOR NEW IDEAS")
-    print(f"  Pulling data", end="", flush=True)
-
-    rows = []
-    for ticker in universe:
-        info = fetch_info(ticker)
-        if not info or not info.get("live_price"):
-            print("·", end="", flush=True)
-            continue
-        info["ticker"] = ticker
-        info["score"]  = score_candidate(info)
-        rows.append(info)
-        print(".", end="", flush=True)
+
+    ranges = fetch_ranges(universe)
+    print(f"  Stage 1 · priced {len(ranges)} of {len(universe)} in one download", end="")
+    if shortlist and len(ranges) > shortlist:
+        near_high = ranges["live_price"] / ranges["w52_high"].where(ranges["w52_high"] > 0)
+        keep = near_high.fillna(0).sort_values(ascending=False, kind="stable").index[:shortlist]
+        ranges = ranges[ranges.index.isin(keep)]
+        print(f", shortlisted the {shortlist} nearest their 52w high", end="")
+    print(f"\n  Stage 2 · pulling fundamentals for {len(ranges)}", end="", flush=True)
+
+    batch = ranges.index.tolist()
+    infos = fetch_sharded(batch, shards, workers, timeout)
     print(" done.\n")
 
-    if not rows:
+    df = pd.DataFrame([{**info, "ticker": t} for t, info in zip(batch, infos) if info])
+    if df.empty:
         return pd.DataFrame()
-
-    df = pd.DataFrame(rows).sort_values("score", ascending=False)
-    return df.head(15).reset_index(drop=True)
+    # Score on the stage-1 price range, the same one the shortlist used
+    for col in ranges.columns:
+        df[col] = df["ticker"].map(ranges[col])
+    df["score"] = score_frame(df)
+    df = df.sort_values("score", ascending=False, kind="stable")
+    return df.head(TOP_N).reset_index(drop=True)
 
 
 def print_candidates(df: pd.DataFrame):
@@ -295,42 +888,78 @@ def print_candidates(df: pd.DataFrame):
     print(f"  {'#':<3} {'Ticker':<7} {'Name':<24} {'Price':>9} {'FwdPE':>7} {'RevGrw':>8} {'GrsMgn':>8} {'Score':>6}  Analyst")
     print(f"  {'─'*84}")
 
-    for i, (_, r) in enumerate(df.iterrows(), 1):
-        name    = str(r.get("name", ""))[:22]
-        price   = f"${r['live_price']:>8.2f}"   if r.get("live_price")   else "       N/A"
-        fwd_pe  = f"{r['fwd_pe']:>7.1f}"        if pd.notna(r.get("fwd_pe")) else "    N/A"
-        rev_g   = f"{r['rev_growth']*100:>7.1f}%" if pd.notna(r.get("rev_growth")) else "     N/A"
-        gm      = f"{r['gross_margin']*100:>7.1f}%" if pd.notna(r.get("gross_margin")) else "     N/A"
-        score   = f"{r['score']:>6.2f}"
-        analyst = str(r.get("analyst") or "N/A")
-        sector  = str(r.get("sector_live") or "")[:20]
-        print(f"  {i:<3} {r['ticker']:<7} {name:<24} {price} {fwd_pe} {rev_g} {gm} {score}  {analyst}  {sector}")
+    rank  = pd.Series(range(1, len(df) + 1), index=df.index)
+    price = num_col(df, "live_price")
+    lines = ("  " + fmt_col(rank, "{:<3}")
+             + " " + fmt_col(df["ticker"], "{:<7}")
+             + " " + fmt_col(text_col(df, "name").str[:22], "{:<24}")
+             + " " + fmt_col(price, "${:>8.2f}", "       N/A", valid=price.fillna(0) != 0)
+             + " " + fmt_col(num_col(df, "fwd_pe"), "{:>7.1f}", "    N/A")
+             + " " + fmt_col(num_col(df, "rev_growth") * 100, "{:>7.1f}%", "     N/A")
+             + " " + fmt_col(num_col(df, "gross_margin") * 100, "{:>7.1f}%", "     N/A")
+             + " " + fmt_col(df["score"], "{:>6.2f}")
+             + "  " + text_col(df, "analyst", "N/A")
+             + "  " + text_col(df, "sector_live").str[:20])
+    print("\n".join(lines))
 
     print(f"\n  Score legend: 10 = perfect match · 7+ = strong candidate · <5 = weaker fit")
 
 
 # ── Report ────────────────────────────────────────────────────────────────────
 
-def save_report(holdings: pd.DataFrame, candidates: pd.DataFrame):
+def save_report(holdings: pd.DataFrame, candidates: pd.DataFrame, risk: dict = None,
+                path: Path = None, title: str = "Portfolio Report",
+                portfolios: dict[str, pd.DataFrame] = None):
+    """Write the markdown report; `portfolios` adds a per-account breakdown (batch mode)."""
+    path = path or REPORT_FILE
     total = holdings["value_usd"].sum()
     date  = datetime.today().strftime("%Y-%m-%d")
     lines = [
-        f"# Portfolio Report — {date}",
+        f"# {title} — {date}",
         "",
         f"**Total value:** ${total:,.2f}  |  **Holdings:** {len(holdings)}",
         "",
-        "## Sector Allocation",
-        "",
     ]
 
-    sector_df = holdings.groupby("sector")["value_usd"].sum().sort_values(ascending=False)
-    for s, v in sector_df.items():
-        lines.append(f"- **{s}**: ${v:,.0f} ({v/total*100:.1f}%)")
+    if portfolios:
+        lines += ["## Portfolios", "", "| Portfolio | Value | % | Holdings |", "| --- | --- | --- | --- |"]
+        for name, df in portfolios.items():
+            value = df["value_usd"].sum()
+            lines.append(f"| {name} | ${value:,.0f} | {value / total * 100:.1f}% | {len(df)} |")
+        lines.append("")
 
+    lines += ["## Sector Allocation", ""]
+
+    def allocation_lines(col: str) -> list[str]:
+        alloc = allocation(holdings, col)
+        return ("- **" + alloc[col].astype(str) + "**: $" + fmt_col(alloc["value_usd"], "{:,.0f}")
+                + " (" + fmt_col(alloc["pct"], "{:.1f}") + "%)").tolist()
+
+    lines += allocation_lines("sector")
     lines += ["", "## Horizon Allocation", ""]
-    horizon_df = holdings.groupby("horizon")["value_usd"].sum().sort_values(ascending=False)
-    for h, v in horizon_df.items():
-        lines.append(f"- **{h}**: ${v:,.0f} ({v/total*100:.1f}%)")
+    lines += allocation_lines("horizon")
+
+    if risk:
+        beta = f"{risk['beta']:.2f}" if risk["beta"] is not None else "N/A"
+        conf = f"{risk['confidence']:.0%}"
+        lines += [
+            "", f"## Risk ({HISTORY_PERIOD} daily, vs {risk['benchmark']})", "",
+            f"- **Coverage:** {risk['coverage']:.1%} of value over {risk['days']} days",
+            f"- **Volatility:** {risk['vol']:.1%} annualized",
+            f"- **Beta:** {beta}",
+            f"- **1-day VaR {conf}:** ${risk['var_hist'] * risk['total']:,.0f} ({risk['var_hist']:.2%}) historical"
+            f" · ${risk['var_param'] * risk['total']:,.0f} ({risk['var_param']:.2%}) parametric",
+        ]
+        if short := short_histories(risk):
+            lines.append(f"- **Short history:** {', '.join(short)}")
+        lines += ["", "| Ticker | Weight | Vol | Beta | Risk Share | Days |", "| --- | --- | --- | --- | --- | --- |"]
+        rows = risk_rows(risk)
+        lines += ("| " + rows["ticker"].astype(str)
+                  + " | " + fmt_col(rows["weight"] * 100, "{:.1f}%")
+                  + " | " + fmt_col(rows["vol"] * 100, "{:.1f}%")
+                  + " | " + fmt_col(rows["beta"], "{:.2f}")
+                  + " | " + fmt_col(rows["risk_share"] * 100, "{:.1f}%")
+                  + " | " + fmt_col(rows["obs"], "{}") + " |").tolist()
 
     if not candidates.empty:
         lines += [
@@ -338,17 +967,27 @@ def save_report(holdings: pd.DataFrame, candidates: pd.DataFrame):
             f"| # | Ticker | Name | Price | Fwd PE | Rev Growth | Gross Margin | Score | Analyst |",
             f"| --- | --- | --- | --- | --- | --- | --- | --- | --- |",
         ]
-        for i, (_, r) in enumerate(candidates.iterrows(), 1):
-            name  = str(r.get("name", ""))[:22]
-            price = f"${r['live_price']:.2f}"         if r.get("live_price")       else "N/A"
-            fpe   = f"{r['fwd_pe']:.1f}"              if pd.notna(r.get("fwd_pe")) else "N/A"
-            rg    = f"{r['rev_growth']*100:.1f}%"     if pd.notna(r.get("rev_growth")) else "N/A"
-            gm    = f"{r['gross_margin']*100:.1f}%"   if pd.notna(r.get("gross_margin")) else "N/A"
-            score = f"{r['score']:.2f}"
-            lines.append(f"| {i} | {r['ticker']} | {name} | {price} | {fpe} | {rg} | {gm} | {score} | {r.get('analyst','N/A')} |")
+        c = candidates
+        rank  = pd.Series(range(1, len(c) + 1), index=c.index).astype(str)
+        price = num_col(c, "live_price")
+        lines += ("| " + rank
+                  + " | " + c["ticker"].astype(str)
+                  + " | " + text_col(c, "name").str[:22]
+                  + " | " + fmt_col(price, "${:.2f}", valid=price.fillna(0) != 0)
+                  + " | " + fmt_col(num_col(c, "fwd_pe"), "{:.1f}")
+                  + " | " + fmt_col(num_col(c, "rev_growth") * 100, "{:.1f}%")
+                  + " | " + fmt_col(num_col(c, "gross_margin") * 100, "{:.1f}%")
+                  + " | " + fmt_col(c["score"], "{:.2f}")
+                  + " | " + text_col(c, "analyst", "N/A") + " |").tolist()
+
+    path.write_text("\n".join(lines))
+    print(f"\n  Report saved → {path}")
 
-    REPORT_FILE.write_text("\n".join(lines))
-    print(f"\n  Report saved → {REPORT_FILE}")
+
+def batch_report_file(name: str) -> Path:
+    """report-<name>.md next to REPORT_FILE for one portfolio in batch mode."""
+    slug = "".join(c if c.isalnum() else "-" for c in name.lower()).strip("-")
+    return REPORT_FILE.with_name(f"{REPORT_FILE.stem}-{slug}{REPORT_FILE.suffix}")
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
@@ -358,29 +997,149 @@ def main():
     parser.add_argument("--screen", action="store_true", help="Screen for new stock ideas")
     parser.add_argument("--report", action="store_true", help="Save markdown report")
     parser.add_argument("--fast",   action="store_true", help="Skip live yfinance enrichment")
+    parser.add_argument("--risk",   action="store_true",
+                        help=f"Volatility, beta and VaR from {HISTORY_PERIOD} of daily closes")
     parser.add_argument("--top",    type=int, default=10, help="Number of top holdings to show (default 10)")
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS,
+                        help=f"Concurrent yfinance fetches (default {FETCH_WORKERS})")
+    parser.add_argument("--timeout", type=float, default=FETCH_TIMEOUT,
+                        help=f"Per-ticker fetch timeout in seconds (default {FETCH_TIMEOUT:g})")
+    parser.add_argument("--rate", type=float, default=YAHOO.rate,
+                        help=f"Starting yfinance request rate per second, adapts from there "
+                             f"(default {YAHOO.rate:g})")
+    parser.add_argument("--holdings", type=Path, nargs="+", metavar="CSV",
+                        help="Holdings file(s). Several files run in batch mode: tickers are "
+                             "fetched once for all of them, each gets its own summary and "
+                             f"report, plus a consolidated view (default {HOLDINGS_FILE.name})")
+    parser.add_argument("--universe", type=Path,
+                        help="Screen tickers from a file (CSV with a ticker column, or one per line)")
+    parser.add_argument("--shortlist", type=int, default=SHORTLIST,
+                        help="Opt-in lossy screen: keep only N names after the bulk price "
+                             "download, nearest their 52w high first, and fetch fundamentals "
+                             "for those (default 0 = every priced name, exact top 15)")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="Worker processes for screening (default: auto, one per "
+                             f"{SHARD_SIZE} tickers)")
+    parser.add_argument("--watch", nargs="?", type=float, const=WATCH_INTERVAL, metavar="SECONDS",
+                        help="Live dashboard: poll bulk quotes every SECONDS (default "
+                             f"{WATCH_INTERVAL:g}) and repaint what changed, until Ctrl-C")
+    parser.add_argument("--export", nargs="?", type=Path, const=EXPORT_DIR, metavar="DIR",
+                        help="Write holdings, sector/horizon allocation and candidates as typed "
+                             f"files (default dir {EXPORT_DIR.name}/)")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl",
+                        help="Export format (default jsonl)")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="Don't save enriched holdings/candidates to the snapshot store")
+    parser.add_argument("--offline", action="store_true",
+                        help="No network — serve last known values from the cache")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Bypass the on-disk yfinance cache")
+    parser.add_argument("--profile", nargs="?", type=Path, const=True, metavar="JSON",
+                        help="Print phase timings and fetch stats, and save them as JSON "
+                             "(default profiles/analyzer-<time>.json)")
     args = parser.parse_args()
-
-    holdings = load_holdings()
+    if args.offline and args.watch:
+        parser.error("--watch polls live quotes and can't run with --offline")
+
+    configure_cache(offline=args.offline, enabled=not args.no_cache)
+    YAHOO.rate = args.rate
+    if not args.offline and (args.screen or args.risk or not args.fast):
+        load_yfinance()   # surface a missing install here, not as empty rows from worker threads
+    with PROFILE.phase("load_holdings"):
+        portfolios = load_portfolios(args.holdings or [HOLDINGS_FILE])
+        holdings = consolidate(portfolios)
+        existing = set(holdings["ticker"].str.upper())
+        universe = load_universe(args.universe) if args.universe else SCREEN_UNIVERSE
+    batch = len(portfolios) > 1
 
     if not args.fast:
-        holdings = enrich_holdings(holdings)
-
-    portfolio_summary(holdings)
-    top_holdings(holdings, n=args.top)
+        with PROFILE.phase("enrich_holdings"):
+            holdings = enrich_holdings(holdings, args.workers, args.timeout)
+            if batch:
+                portfolios = {name: attach_market_data(df, holdings) for name, df in portfolios.items()}
+
+    if args.watch:
+        # Fundamentals were fetched once above; each tick is one bulk quote download
+        watch_portfolio(holdings, download_prices, args.watch, args.top)
+        return
 
-    if not args.fast:
-        valuation_snapshot(holdings)
+    with PROFILE.phase("render_summary"):
+        if batch:
+            for name, df in portfolios.items():
+                portfolio_summary(df, title=name.upper())
+                top_holdings(df, n=args.top)
+                if not args.fast:
+                    valuation_snapshot(df)
+            portfolio_summary(holdings, title=f"CONSOLIDATED · {len(portfolios)} PORTFOLIOS")
+            portfolio_breakdown(portfolios)
+            top_holdings(holdings, n=args.top)
+        else:
+            portfolio_summary(holdings)
+            top_holdings(holdings, n=args.top)
+            if not args.fast:
+                valuation_snapshot(holdings)
+
+    risk, risks = None, {}
+    if args.risk:
+        with PROFILE.phase("risk"):
+            # One history download covers every portfolio
+            prices = fetch_price_history(holdings["ticker"].tolist() + [BENCHMARK])
+            if batch:
+                for name, df in portfolios.items():
+                    risks[name] = portfolio_risk(df, prices)
+                    print_risk(risks[name], title=f"RISK · {name.upper()}")
+            risk = portfolio_risk(holdings, prices)
+            print_risk(risk, title="RISK · CONSOLIDATED" if batch else "RISK")
 
     candidates = pd.DataFrame()
     if args.screen:
-        existing = set(holdings["ticker"].str.upper())
-        candidates = screen_candidates(existing)
-        print_candidates(candidates)
+        with PROFILE.phase("screen_candidates"):
+            candidates = screen_candidates(existing, args.workers, args.timeout,
+                                           universe, args.shards, args.shortlist)
+            print_candidates(candidates)
 
     if args.report:
-        save_report(holdings, candidates)
-
+        with PROFILE.phase("save_report"):
+            if batch:
+                for name, df in portfolios.items():
+                    save_report(df, pd.DataFrame(), risks.get(name), batch_report_file(name),
+                                title=f"Portfolio Report · {name}")
+            save_report(holdings, candidates, risk,
+                        title="Consolidated Portfolio Report" if batch else "Portfolio Report",
+                        portfolios=portfolios if batch else None)
+
+    # Batch runs keep each account's rows, tagged, rather than the merged view
+    if batch:
+        holding_rows = pd.concat([df.assign(portfolio=name) for name, df in portfolios.items()],
+                                 ignore_index=True)
+    else:
+        holding_rows = holdings
+
+    if args.export:
+        with PROFILE.phase("export"):
+            frames = {
+                "holdings":   holding_rows,
+                "sectors":    allocation(holdings, "sector"),
+                "horizons":   allocation(holdings, "horizon"),
+                "candidates": candidates,
+            }
+            if batch:
+                frames["portfolios"] = allocation(holding_rows, "portfolio")
+            paths = export_results(frames, args.export, args.format)
+            print(f"\n  Exported {', '.join(p.name for p in paths)} → {args.export}")
+
+    # Replayed cache data isn't a new observation — only snapshot live runs
+    if not (args.fast or args.offline or args.no_snapshot):
+        with PROFILE.phase("save_snapshot"):
+            save_snapshot({"holdings": holding_rows, "candidates": candidates})
+
+    if args.profile:
+        PROFILE.print_summary()
+        path = PROFILE.save("analyzer", None if args.profile is True else args.profile)
+        print(f"\n  Profile saved → {path}")
+
+    if YAHOO.summary():
+        print(f"\n  ⚠  {YAHOO.summary()}")
     print()
 
 
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Screener Backtest
+=================
+Replays the fundamentals saved in the snapshot store (holdings + candidates,
+one run per day) against cached daily closes, and sweeps score_candidate's
+weights and thresholds to see which configurations actually predict forward
+returns.
+
+Every configuration is a row of SCORE_PARAMS; a chunk of configurations is
+scored against all observations at once as a (configs × observations) NumPy
+matrix, and chunks are spread over a process pool. Per configuration it
+reports, averaged over snapshot dates:
+
+  top_ret  mean forward return of the top N scored names
+  excess   top_ret minus the mean forward return of every scored name
+  hit      share of dates where excess > 0
+  ic       rank correlation of score vs forward return (Spearman), and its t-stat
+
+Usage:
+    python backtest.py                                # default grid, 20-day forward returns
+    python backtest.py --horizon 60 --top 10          # 3-month returns, top 10
+    python backtest.py --grid grid.json --workers 8   # {"param": [values, ...]}
+    python backtest.py --observations fundamentals.csv --csv sweep.csv
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analyzer import BENCHMARK, TOP_N, configure_cache, fetch_price_history
+from store import load_snapshots
+
+warnings.filterwarnings("ignore")
+
+# score_candidate's constants, in matrix column order — the baseline configuration
+SCORE_PARAMS = {
+    "growth_w":     3.0,  "growth_cap":   0.5,
+    "pe_lo":        15.0, "pe_hi":        45.0, "pe_max":   70.0, "pe_in_w":  2.0, "pe_ok_w":  1.0,
+    "roe_hi":       0.25, "roe_lo":       0.15, "roe_hi_w": 1.5,  "roe_lo_w": 1.0,
+    "strong_buy_w": 2.0,  "buy_w":        1.5,
+    "mom_hi":       0.85, "mom_lo":       0.70, "mom_hi_w": 1.0,  "mom_lo_w": 0.5,
+    "gm_hi":        0.60, "gm_lo":        0.40, "gm_hi_w":  0.5,  "gm_lo_w":  0.25,
+}
+PARAM_INDEX = {name: i for i, name in enumerate(SCORE_PARAMS)}
+
+# 4·3·3·3·2·3·3 = 1,944 configurations
+DEFAULT_GRID = {
+    "growth_w": [1.0, 2.0, 3.0, 4.0],
+    "pe_lo":    [10.0, 15.0, 20.0],
+    "pe_hi":    [35.0, 45.0, 60.0],
+    "roe_hi":   [0.20, 0.25, 0.30],
+    "buy_w":    [0.5, 1.5],
+    "mom_hi_w": [0.0, 1.0, 2.0],
+    "gm_hi_w":  [0.0, 0.5, 1.0],
+}
+
+HORIZON    = 20     # trading days
+CHUNK_SIZE = 128    # configurations per scoring matrix
+FIELDS     = ["rev_growth", "fwd_pe", "roe", "analyst", "live_price", "w52_high", "gross_margin"]
+STATS      = ["top_ret", "excess", "hit", "ic", "ic_t"]
+
+
+# ── Observations ──────────────────────────────────────────────────────────────
+
+def load_observations(path: Path = None, start=None, end=None) -> pd.DataFrame:
+    """
+    (date, ticker) rows with the fundamentals score_candidate uses — from a
+    CSV/Arrow file with date and ticker columns, or else from the last
+    snapshot run of each day. Rows without any fundamentals (ETFs, crypto)
+    are dropped.
+    """
+    if path:
+        path = Path(path)
+        df = pd.read_feather(path) if path.suffix == ".arrow" else pd.read_csv(path)
+    else:
+        df = pd.concat([load_snapshots(kind, start, end, latest_per_day=True)
+                        for kind in ("holdings", "candidates")], ignore_index=True)
+    if df.empty:
+        return df
+
+    df = df.reindex(columns=["date", "ticker"] + FIELDS)
+    df["date"] = pd.to_datetime(df["date"]).dt.normalize()
+    for col in FIELDS:
+        if col != "analyst":
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    df = df.dropna(subset=["rev_growth", "fwd_pe", "roe", "gross_margin"], how="all")
+    return df.drop_duplicates(["date", "ticker"], keep="last").reset_index(drop=True)
+
+
+def forward_returns(obs: pd.DataFrame, prices: pd.DataFrame, horizon: int = HORIZON) -> np.ndarray:
+    """Close `horizon` trading days after each observation's date over the close on it (NaN if unknown)."""
+    prices = prices.ffill()
+    P = prices.to_numpy(dtype=float)
+    row = prices.index.searchsorted(obs["date"].to_numpy(), side="right") - 1
+    col = prices.columns.get_indexer(obs["ticker"])
+    ok = (row >= 0) & (row + horizon < len(P)) & (col >= 0)
+    fwd = np.full(len(obs), np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fwd[ok] = P[row[ok] + horizon, col[ok]] / P[row[ok], col[ok]] - 1
+    return fwd
+
+
+def to_arrays(obs: pd.DataFrame, fwd: np.ndarray) -> dict:
+    """Plain NumPy inputs for the workers, plus observation indices grouped by date."""
+    keep = np.isfinite(fwd)
+    obs, fwd = obs[keep].reset_index(drop=True), fwd[keep]
+    analyst = obs["analyst"].fillna("").astype(str).str.lower().to_numpy()
+    return {
+        "rg":    np.nan_to_num(obs["rev_growth"].to_numpy(dtype=float)),
+        "fpe":   obs["fwd_pe"].to_numpy(dtype=float),
+        "roe":   obs["roe"].to_numpy(dtype=float),
+        "sb":    analyst == "strong_buy",
+        "buy":   analyst == "buy",
+        "price": obs["live_price"].to_numpy(dtype=float),
+        "high":  obs["w52_high"].to_numpy(dtype=float),
+        "gm":    obs["gross_margin"].to_numpy(dtype=float),
+        "fwd":   fwd,
+        "dates": [idx for idx in obs.groupby("date").indices.values()],
+    }
+
+
+# ── Scoring ───────────────────────────────────────────────────────────────────
+
+def score_matrix(configs: np.ndarray, obs: dict) -> np.ndarray:
+    """score_candidate for every (configuration, observation) pair → C × N."""
+    p = {name: configs[:, [i]] for name, i in PARAM_INDEX.items()}   # C × 1, broadcasts over N
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct_high = np.where(obs["high"] > 0, obs["price"] / obs["high"], np.nan)
+        score  = np.minimum(obs["rg"], p["growth_cap"]) / p["growth_cap"] * p["growth_w"]
+        score += np.where((obs["fpe"] >= p["pe_lo"]) & (obs["fpe"] <= p["pe_hi"]), p["pe_in_w"],
+                          np.where((obs["fpe"] > 0) & (obs["fpe"] <= p["pe_max"]), p["pe_ok_w"], 0.0))
+        score += np.where(obs["roe"] > p["roe_hi"], p["roe_hi_w"],
+                          np.where(obs["roe"] > p["roe_lo"], p["roe_lo_w"], 0.0))
+        score += np.where(obs["sb"], p["strong_buy_w"], np.where(obs["buy"], p["buy_w"], 0.0))
+        score += np.where(pct_high >= p["mom_hi"], p["mom_hi_w"],
+                          np.where(pct_high >= p["mom_lo"], p["mom_lo_w"], 0.0))
+        score += np.where(obs["gm"] > p["gm_hi"], p["gm_hi_w"],
+                          np.where(obs["gm"] > p["gm_lo"], p["gm_lo_w"], 0.0))
+    return score
+
+
+def _rank_corr(scores: np.ndarray, fwd: np.ndarray) -> np.ndarray:
+    """Spearman correlation of each row of `scores` with `fwd` (ties get average ranks)."""
+    rs = pd.DataFrame(scores).rank(axis=1).to_numpy()
+    rf = pd.Series(fwd).rank().to_numpy()
+    rs = rs - rs.mean(axis=1, keepdims=True)
+    rf = rf - rf.mean()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return rs @ rf / (np.linalg.norm(rs, axis=1) * np.linalg.norm(rf))
+
+
+def evaluate(configs: np.ndarray, obs: dict, top: int = TOP_N) -> np.ndarray:
+    """STATS for each configuration → C × len(STATS)."""
+    scores = score_matrix(configs, obs)
+    top_ret, excess, ics = [], [], []
+    for idx in obs["dates"]:
+        fwd = obs["fwd"][idx]
+        s = scores[:, idx]
+        if len(idx) > top:
+            best = np.argsort(-s, axis=1, kind="stable")[:, :top]
+            ret = fwd[best].mean(axis=1)
+            top_ret.append(ret)
+            excess.append(ret - fwd.mean())
+        if len(idx) > 2:
+            ics.append(_rank_corr(s, fwd))
+
+    C = len(configs)
+    out = np.full((C, len(STATS)), np.nan)
+    if top_ret:
+        top_ret, excess = np.array(top_ret), np.array(excess)   # dates × C
+        out[:, 0] = top_ret.mean(axis=0)
+        out[:, 1] = excess.mean(axis=0)
+        out[:, 2] = (excess > 0).mean(axis=0)
+    if ics:
+        ics = np.array(ics)
+        n = np.isfinite(ics).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[:, 3] = np.nanmean(ics, axis=0)
+            out[:, 4] = out[:, 3] / (np.nanstd(ics, axis=0, ddof=1) / np.sqrt(n))
+    return out
+
+
+# Observations are shipped to each worker once, not with every chunk
+_OBS: dict = {}
+
+
+def _init_worker(obs: dict):
+    global _OBS
+    _OBS = obs
+
+
+def _evaluate_chunk(configs: np.ndarray, top: int) -> np.ndarray:
+    return evaluate(configs, _OBS, top)
+
+
+# ── Sweep ─────────────────────────────────────────────────────────────────────
+
+def build_grid(grid: dict[str, list]) -> np.ndarray:
+    """Cartesian product of `grid` over the SCORE_PARAMS baseline → configs × params."""
+    unknown = set(grid) - set(SCORE_PARAMS)
+    if unknown:
+        raise ValueError(f"unknown score params: {', '.join(sorted(unknown))}")
+    names = list(grid)
+    base = np.array(list(SCORE_PARAMS.values()))
+    configs = np.tile(base, (int(np.prod([len(v) for v in grid.values()])), 1))
+    for row, values in enumerate(itertools.product(*grid.values())):
+        for name, value in zip(names, values):
+            configs[row, PARAM_INDEX[name]] = value
+    return configs
+
+
+def sweep(configs: np.ndarray, obs: dict, top: int = TOP_N, workers: int = 0) -> np.ndarray:
+    """evaluate() over all configurations in CHUNK_SIZE chunks on a process pool."""
+    workers = workers or os.cpu_count() or 1
+    chunks = [configs[i:i + CHUNK_SIZE] for i in range(0, len(configs), CHUNK_SIZE)]
+    if workers <= 1 or len(chunks) == 1:
+        return np.vstack([evaluate(c, obs, top) for c in chunks])
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                             initializer=_init_worker, initargs=(obs,)) as pool:
+        return np.vstack(list(pool.map(_evaluate_chunk, chunks, itertools.repeat(top))))
+
+
+def results_frame(configs: np.ndarray, stats: np.ndarray, grid: dict) -> pd.DataFrame:
+    """Swept params + STATS per configuration, baseline flagged."""
+    df = pd.DataFrame(configs[:, [PARAM_INDEX[n] for n in grid]], columns=list(grid))
+    df[STATS] = stats
+    base = np.array(list(SCORE_PARAMS.values()))
+    df["baseline"] = (configs == base).all(axis=1)
+    return df
+
+
+def print_results(df: pd.DataFrame, sort: str, n: int = 20):
+    params = [c for c in df.columns if c not in STATS + ["baseline"]]
+    ranked = df.sort_values(sort, ascending=False, kind="stable")
+    rows = pd.concat([ranked.head(n), ranked[ranked["baseline"]]]).drop_duplicates()
+    header = "  ".join(f"{p:>9}" for p in params)
+    print(f"\n  {'#':>5}  {header}  {'TopRet':>8} {'Excess':>8} {'Hit':>6} {'IC':>7} {'IC t':>6}")
+    print(f"  {'─'*(7 + len(header) + 42)}")
+    for rank, (i, r) in zip(ranked.index.get_indexer(rows.index) + 1, rows.iterrows()):
+        values = "  ".join(f"{r[p]:>9g}" for p in params)
+        print(f"  {rank:>5}  {values}  {r['top_ret']:>+7.2%} {r['excess']:>+7.2%} {r['hit']:>6.0%} "
+              f"{r['ic']:>+7.3f} {r['ic_t']:>6.2f}{'  ← baseline' if r['baseline'] else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest score_candidate weights on saved snapshots")
+    parser.add_argument("--observations", type=Path,
+                        help="CSV/Arrow of historical fundamentals (date, ticker, ...) instead of snapshots/")
+    parser.add_argument("--start",   help="First snapshot date (YYYY-MM-DD)")
+    parser.add_argument("--end",     help="Last snapshot date (YYYY-MM-DD)")
+    parser.add_argument("--horizon", type=int, default=HORIZON,
+                        help=f"Forward-return horizon in trading days (default {HORIZON})")
+    parser.add_argument("--top",     type=int, default=TOP_N,
+                        help=f"Names held per date (default {TOP_N})")
+    parser.add_argument("--grid",    type=Path, help="JSON {param: [values]} to sweep (default built-in)")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: all CPUs)")
+    parser.add_argument("--sort",    choices=STATS, default="excess", help="Rank by (default excess)")
+    parser.add_argument("--csv",     type=Path, help="Write every configuration's results as CSV")
+    parser.add_argument("--offline", action="store_true", help="Use cached price history only")
+    args = parser.parse_args()
+
+    grid = json.loads(args.grid.read_text()) if args.grid else DEFAULT_GRID
+    configs = build_grid(grid)
+
+    obs = load_observations(args.observations, args.start, args.end)
+    if obs.empty:
+        print("  No observations — run analyzer.py for a while to build up snapshots/, or pass --observations.")
+        return
+
+    configure_cache(offline=args.offline)
+    prices = fetch_price_history(obs["ticker"].unique().tolist() + [BENCHMARK])
+    arrays = to_arrays(obs, forward_returns(obs, prices, args.horizon))
+    n_obs, n_dates = len(arrays["fwd"]), len(arrays["dates"])
+    print(f"  {n_obs:,} observations with {args.horizon}d forward returns over {n_dates} dates "
+          f"(of {len(obs):,} loaded) · {len(configs):,} configurations")
+    if not n_obs:
+        return
+
+    start = time.perf_counter()
+    df = results_frame(configs, sweep(configs, arrays, args.top, args.workers), grid)
+    print(f"  Swept in {time.perf_counter() - start:.1f}s")
+
+    print_results(df, args.sort)
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+        print(f"\n  Results saved → {args.csv}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Analyzer Benchmarks
+===================
+Times each analyzer.py phase against a local fake of yfinance, so numbers are
+reproducible and don't depend on (or hammer) Yahoo. The fake replays recorded
+.info fixtures with configurable latency and failure rate; holdings files of
+any size are generated synthetically.
+
+For each phase and holdings size it reports wall time, requests issued to the
+(fake) yfinance, and peak traced Python memory.
+
+Usage:
+    python bench.py                                   # 10 … 100k holdings
+    python bench.py --sizes 100 1000 --latency 50     # 50ms per request
+    python bench.py --fail-rate 0.05 --json bench.json
+    python bench.py --record NVDA AMD LLY             # Record live .info fixtures
+    python bench.py --startup                         # CLI import-time budgets
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import analyzer
+import scheduler
+
+warnings.filterwarnings("ignore")
+
+HERE = Path(__file__).parent
+FIXTURES_FILE = HERE / "bench_fixtures.json"
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+SECTORS  = ["Information Technology", "Communication Services", "Health Care", "Financials",
+            "Consumer Discretionary", "Energy", "Industrials", "Crypto", "Index"]
+HORIZONS = ["Short (<3)", "Medium (3-10)", "Long (Never)"]
+
+# CLI invocations that run from cron / shell loops, with their import-time
+# budget (ms). None of them may pull in a LAZY_MODULES entry at startup.
+# {csv} is a small synthetic holdings file written for the check.
+STARTUP_CHECKS = [
+    (["analyzer.py", "--help"],                           1000),
+    (["analyzer.py", "--fast", "--no-snapshot", "--holdings", "{csv}"], 1000),
+    (["deep_dive.py", "--help"],                          1000),
+    (["../business-ideas/reddit_scout.py", "--help"],     250),
+]
+LAZY_MODULES = ["yfinance", "langchain_anthropic", "langchain_core", "dotenv"]
+
+
+# ── Fake yfinance ─────────────────────────────────────────────────────────────
+
+class FakeYFinance:
+    """
+    Drop-in for the parts of the yfinance module analyzer.py uses
+    (Ticker(...).info and download). Tickers without a recorded fixture get
+    a deterministic synthetic one derived from a recorded template.
+    """
+
+    def __init__(self, fixtures: dict, latency: float = 0.0, jitter: float = 0.0,
+                 fail_rate: float = 0.0, seed: int = 0):
+        self.fixtures = fixtures
+        self.templates = list(fixtures.values()) or [synthetic_info("_", random.Random(seed))]
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.seed = seed
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    def _request(self):
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            fail = self._rng.random() < self.fail_rate
+            if fail:
+                self.failures += 1
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise RuntimeError("Too Many Requests. Rate limited. Try after a while.")
+
+    def info_for(self, ticker: str) -> dict:
+        if ticker in self.fixtures:
+            return dict(self.fixtures[ticker])
+        rng = random.Random(f"{self.seed}:{ticker}")
+        info = dict(rng.choice(self.templates))
+        for k, v in info.items():
+            if isinstance(v, float):
+                info[k] = v * rng.uniform(0.5, 1.5)
+        info["shortName"] = f"{ticker} Corp"
+        return info
+
+    def Ticker(self, ticker: str):
+        fake = self
+
+        class _Ticker:
+            @property
+            def info(self) -> dict:
+                fake._request()
+                return fake.info_for(ticker)
+
+        return _Ticker()
+
+    def download(self, tickers, period: str = "5d", **kwargs) -> pd.DataFrame:
+        self._request()
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        days = {"5d": 5, "1mo": 21, "1y": 252, "5y": 1260}.get(period, 5)
+        index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=days)
+        rng = np.random.default_rng(self.seed)
+        base = np.array([self.info_for(t).get("currentPrice") or 100.0 for t in tickers])
+        close = base * np.exp(np.cumsum(rng.normal(0, 0.02, (days, len(tickers))), axis=0))
+        frames = {"Close": close, "High": close * 1.01, "Low": close * 0.99}
+        columns = pd.MultiIndex.from_product([list(frames), tickers])
+        return pd.DataFrame(np.hstack(list(frames.values())), index=index, columns=columns)
+
+
+def synthetic_info(ticker: str, rng: random.Random) -> dict:
+    price = rng.uniform(10, 600)
+    return {
+        "shortName": f"{ticker} Corp", "currentPrice": price, "marketCap": rng.uniform(1e9, 3e12),
+        "trailingPE": rng.uniform(8, 90), "forwardPE": rng.uniform(8, 70), "pegRatio": rng.uniform(0.5, 3),
+        "priceToSalesTrailing12Months": rng.uniform(1, 30), "priceToBook": rng.uniform(1, 40),
+        "revenueGrowth": rng.uniform(-0.1, 0.6), "earningsGrowth": rng.uniform(-0.3, 1.0),
+        "grossMargins": rng.uniform(0.2, 0.85), "returnOnEquity": rng.uniform(-0.1, 0.6),
+        "freeCashflow": rng.uniform(-1e9, 5e10), "debtToEquity": rng.uniform(0, 200),
+        "beta": rng.uniform(0.5, 2.5), "recommendationKey": rng.choice(["strong_buy", "buy", "hold"]),
+        "targetMeanPrice": price * rng.uniform(0.9, 1.4), "sector": "Technology", "industry": "Software",
+        "fiftyTwoWeekHigh": price * rng.uniform(1.0, 1.6), "fiftyTwoWeekLow": price * rng.uniform(0.5, 1.0),
+    }
+
+
+def load_fixtures(path: Path = FIXTURES_FILE) -> dict:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def record_fixtures(tickers: list[str], path: Path = FIXTURES_FILE):
+    """Fetch live .info payloads once and save them for replay."""
+    import yfinance as yf
+
+    fixtures = load_fixtures(path)
+    for ticker in tickers:
+        info = yf.Ticker(ticker).info
+        fixtures[ticker] = {k: v for k, v in info.items() if isinstance(v, (int, float, str))}
+        print(f"  recorded {ticker} ({len(fixtures[ticker])} fields)")
+    path.write_text(json.dumps(fixtures, indent=1, sort_keys=True))
+    print(f"  Fixtures saved → {path}")
+
+
+def synthetic_holdings(n: int, n_tickers: int, seed: int = 0) -> pd.DataFrame:
+    """n holdings rows drawn from a pool of n_tickers symbols (repeats model tax lots)."""
+    rng = np.random.default_rng(seed)
+    pool = [f"S{i:05d}" for i in range(n_tickers)]
+    kind = rng.choice(["Equity", "ETF", "Crypto"], size=n, p=[0.7, 0.2, 0.1])
+    ticker = np.array([f"C{t[1:]}-USD" if k == "Crypto" else t
+                       for t, k in zip(rng.choice(pool, size=n), kind)])
+    return pd.DataFrame({
+        "ticker":     ticker,
+        "value_usd":  rng.lognormal(8, 1.5, n).round(2),
+        "horizon":    rng.choice(HORIZONS, size=n),
+        "sector":     np.where(kind == "Crypto", "Crypto", rng.choice(SECTORS[:-2], size=n)),
+        "type":       kind,
+        "key_thesis": "synthetic",
+        "key_risk":   "synthetic",
+    })
+
+
+# ── Harness ───────────────────────────────────────────────────────────────────
+
+class Bench:
+    def __init__(self, fake: FakeYFinance):
+        self.fake = fake
+        self.results = []
+        self.size = 0   # holdings rows in the current round
+
+    @contextlib.contextmanager
+    def phase(self, name: str, rows: int):
+        requests = self.fake.requests
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+        wall = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] - base
+        self.results.append({
+            "size":     self.size,
+            "phase":    name,
+            "rows":     rows,
+            "wall_ms":  round(wall * 1000, 2),
+            "requests": self.fake.requests - requests,
+            "peak_mb":  round(max(peak, 0) / 2**20, 2),
+        })
+
+
+def run(sizes: list[int], fake: FakeYFinance, n_tickers: int, universe_size: int,
+        workers: int) -> list[dict]:
+    bench = Bench(fake)
+    universe = [f"U{i:05d}" for i in range(universe_size)]
+    tmp = Path(tempfile.mkdtemp(prefix="analyzer-bench-"))
+    analyzer.REPORT_FILE = tmp / "report.md"
+
+    tracemalloc.start()
+    try:
+        for n in sizes:
+            path = tmp / f"holdings_{n}.csv"
+            synthetic_holdings(n, min(n_tickers, n)).to_csv(path, index=False)
+            analyzer.HOLDINGS_FILE = path
+            bench.size = n
+
+            with bench.phase("load_holdings", n):
+                holdings = analyzer.load_holdings()
+            with bench.phase("enrich_holdings", n):
+                holdings = analyzer.enrich_holdings(holdings, workers=workers)
+            with bench.phase("portfolio_summary", n):
+                analyzer.portfolio_summary(holdings)
+            with bench.phase("top_holdings", n):
+                analyzer.top_holdings(holdings)
+            with bench.phase("valuation_snapshot", n):
+                analyzer.valuation_snapshot(holdings)
+            # Score the equity rows as fetch_info dicts (None for missing, like the screener sees)
+            equities = holdings[holdings["type"] == "Equity"]
+            infos = equities.astype(object).where(equities.notna(), None).to_dict("records")
+            with bench.phase("score_candidate", len(infos)):
+                for info in infos:
+                    analyzer.score_candidate(info)
+            with bench.phase("score_frame", len(infos)):
+                analyzer.score_frame(equities)
+            with bench.phase("screen_candidates", n):
+                candidates = analyzer.screen_candidates(set(), workers=workers,
+                                                        universe=universe, shards=1)
+            with bench.phase("print_candidates", n):
+                analyzer.print_candidates(candidates)
+            with bench.phase("save_report", n):
+                analyzer.save_report(holdings, candidates)
+    finally:
+        tracemalloc.stop()
+    return bench.results
+
+
+# ── Startup budget ────────────────────────────────────────────────────────────
+
+def startup_profile(argv: list[str]) -> dict:
+    """
+    Run `python -X importtime <argv>` and return wall time, total import time,
+    the heaviest top-level imports and which LAZY_MODULES got loaded.
+    """
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", *argv], cwd=HERE,
+                          capture_output=True, text=True)
+    wall = (time.perf_counter() - start) * 1000
+
+    top, loaded = {}, set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue   # header row
+        loaded.add(name.strip().split(".")[0])
+        if len(name) - len(name.lstrip()) == 1:   # top-level import
+            top[name.strip()] = int(cumulative) / 1000
+    return {
+        "command":   " ".join(argv),
+        "exit":      proc.returncode,
+        "wall_ms":   round(wall, 1),
+        "import_ms": round(sum(top.values()), 1),
+        "heaviest":  sorted(top.items(), key=lambda kv: -kv[1])[:3],
+        "lazy_hit":  [m for m in LAZY_MODULES if m in loaded],
+    }
+
+
+def check_startup() -> bool:
+    """Profile every STARTUP_CHECKS command; True when all are within budget."""
+    ok = True
+    print(f"\n  {'Command':<50} {'Wall ms':>8} {'Import ms':>10} {'Budget':>7}  Heaviest imports")
+    print(f"  {'─'*106}")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = Path(tmp) / "holdings.csv"
+        synthetic_holdings(10, 10).to_csv(csv, index=False)
+        for argv, budget in STARTUP_CHECKS:
+            r = startup_profile([arg.format(csv=csv) for arg in argv])
+            passed = r["exit"] == 0 and r["import_ms"] <= budget and not r["lazy_hit"]
+            ok &= passed
+            heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in r["heaviest"])
+            print(f"  {' '.join(argv):<50} {r['wall_ms']:>8,.0f} {r['import_ms']:>10,.0f} {budget:>7}  "
+                  f"{heaviest}{'' if passed else '   ✗'}")
+            if r["lazy_hit"]:
+                print(f"  {'':<50} loaded at startup: {', '.join(r['lazy_hit'])}")
+            if r["exit"] != 0:
+                print(f"  {'':<50} exited {r['exit']}")
+    return ok
+
+
+def print_results(results: list[dict]):
+    print(f"\n  {'Phase':<20} {'Rows':>8} {'Wall ms':>11} {'Requests':>9} {'Peak MB':>9}")
+    print(f"  {'─'*61}")
+    last_size = None
+    for r in results:
+        if last_size is not None and r["size"] != last_size:
+            print()
+        last_size = r["size"]
+        print(f"  {r['phase']:<20} {r['rows']:>8,} {r['wall_ms']:>11,.1f} {r['requests']:>9,} {r['peak_mb']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analyzer.py phases against a fake yfinance")
+    parser.add_argument("--sizes",     type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Holdings row counts to generate (default 10 … 100k)")
+    parser.add_argument("--tickers",   type=int, default=500,
+                        help="Distinct tickers the holdings are drawn from (default 500)")
+    parser.add_argument("--universe",  type=int, default=500,
+                        help="Screen universe size (default 500)")
+    parser.add_argument("--latency",   type=float, default=5.0, help="Mean ms per fake request (default 5)")
+    parser.add_argument("--jitter",    type=float, default=0.0, help="± ms of uniform latency jitter")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests that raise")
+    parser.add_argument("--workers",   type=int, default=analyzer.FETCH_WORKERS)
+    parser.add_argument("--seed",      type=int, default=0)
+    parser.add_argument("--fixtures",  type=Path, default=FIXTURES_FILE,
+                        help="Recorded .info fixtures to replay (JSON: {ticker: info})")
+    parser.add_argument("--record",    nargs="+", metavar="TICKER",
+                        help="Record live .info fixtures for these tickers and exit")
+    parser.add_argument("--json",      type=Path, help="Also write results as JSON")
+    parser.add_argument("--startup",   action="store_true",
+                        help="Check CLI import-time budgets with -X importtime and exit (1 if over)")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.record, args.fixtures)
+        return
+    if args.startup:
+        sys.exit(0 if check_startup() else 1)
+
+    fake = FakeYFinance(load_fixtures(args.fixtures), args.latency / 1000, args.jitter / 1000,
+                        args.fail_rate, args.seed)
+    # Measure the code, not Yahoo's throttle: no cache, no rate ceiling
+    analyzer.yf = fake
+    analyzer.configure_cache(enabled=False)
+    scheduler.MAX_RATE = 1e9
+    scheduler.BACKOFF = 0.0
+    scheduler.YAHOO.rate = 1e9
+
+    print(f"  Benchmarking analyzer.py · latency {args.latency:g}ms · fail rate {args.fail_rate:g} · "
+          f"{len(fake.fixtures)} fixture(s)")
+    results = run(args.sizes, fake, args.tickers, args.universe, args.workers)
+    print_results(results)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\n  Results saved → {args.json}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+On-disk field cache for yfinance data
+=====================================
+SQLite store of per-ticker fields with per-field TTLs: prices go stale in
+minutes, analyst targets in a day, quarterly fundamentals (growth, margins,
+ROE) in a month. Offline mode serves the last known value regardless of age.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+MINUTE = 60
+HOUR   = 60 * MINUTE
+DAY    = 24 * HOUR
+
+FIELD_TTLS = {
+    "live_price":   15 * MINUTE,
+    "mkt_cap":      DAY,
+    "pe_ttm":       DAY,
+    "fwd_pe":       DAY,
+    "peg":          DAY,
+    "ps":           DAY,
+    "pb":           DAY,
+    "analyst":      DAY,
+    "target_price": DAY,
+    "w52_high":     DAY,
+    "w52_low":      DAY,
+    "beta":         7 * DAY,
+}
+DEFAULT_TTL = 30 * DAY   # everything else only moves with quarterly filings
+
+
+class FieldCache:
+    """Thread-safe (ticker, field) → value store with per-field expiry."""
+
+    def __init__(self, path: Path, ttls: dict = FIELD_TTLS, offline: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttls = ttls
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS fields ("
+            " ticker TEXT, field TEXT, value TEXT, fetched_at REAL,"
+            " PRIMARY KEY (ticker, field))"
+        )
+        self._db.commit()
+
+    def ttl(self, field: str) -> float:
+        return self.ttls.get(field, DEFAULT_TTL)
+
+    def get(self, ticker: str, skip: tuple = ()) -> tuple[dict, bool]:
+        """
+        Return (values, fresh) for every cached field of `ticker`.
+        `fresh` is False when no field outside `skip` is cached or any of
+        them has outlived its TTL.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT field, value, fetched_at FROM fields WHERE ticker = ?", (ticker,)
+            ).fetchall()
+        now = time.time()
+        values = {field: json.loads(value) for field, value, _ in rows}
+        ages = [(field, now - fetched_at) for field, _, fetched_at in rows if field not in skip]
+        fresh = bool(ages) and all(age <= self.ttl(field) for field, age in ages)
+        return values, fresh
+
+    def get_field(self, tickers: list[str], field: str) -> tuple[dict, list[str]]:
+        """Return ({ticker: value} for cached tickers, [tickers that are missing or stale])."""
+        cached, stale = {}, []
+        now = time.time()
+        with self._lock:
+            for ticker in tickers:
+                row = self._db.execute(
+                    "SELECT value, fetched_at FROM fields WHERE ticker = ? AND field = ?",
+                    (ticker, field),
+                ).fetchone()
+                if row is None:
+                    stale.append(ticker)
+                    continue
+                cached[ticker] = json.loads(row[0])
+                if now - row[1] > self.ttl(field):
+                    stale.append(ticker)
+        return cached, stale
+
+    def put(self, ticker: str, values: dict):
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO fields VALUES (?, ?, ?, ?)",
+                [(ticker, k, json.dumps(v), now) for k, v in values.items()],
+            )
+            self._db.commit()
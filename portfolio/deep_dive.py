@@ -1,33 +1,157 @@
-import yfinance as yf, warnings
+#!/usr/bin/env python3
+"""
+Deep Dive — Focused Metrics Table
+=================================
+Price, fwd PE, revenue growth, margins, ROE, analyst rating and upside for a
+focused set of tickers. Fetches concurrently through analyzer.fetch_info,
+prints each row the moment it arrives, then re-renders the full table sorted.
+
+Usage:
+    python deep_dive.py                          # Default picks
+    python deep_dive.py NVDA AMD TSM             # Any tickers
+    python deep_dive.py --file watchlist.txt     # Tickers from a file
+    python deep_dive.py --sort fwd_pe --asc      # Sort the final table
+    python deep_dive.py --profile                # Fetch timings → profiles/*.json
+"""
+
+import argparse
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+from analyzer import (FETCH_TIMEOUT, FETCH_WORKERS, HOLDINGS_FILE, configure_cache,
+                      fetch_info, fetch_many, load_universe, load_yfinance)
+from profiler import PROFILE
+from scheduler import YAHOO
+
 warnings.filterwarnings("ignore")
 
-picks = {
+DEFAULT_PICKS = {
     "META": "current", "NVDA": "current", "AMD": "current", "CLS": "current",
     "LLY": "new", "AVGO": "new", "MA": "new", "MU": "new", "ANET": "new", "NU": "new",
 }
 
-print(f"\n{'─'*130}")
-print(f"{'Status':<9} {'Tick':<6}  {'Price':>9}  {'FwdPE':>7}  {'RevGrw':>8}  {'GM':>7}  {'ROE':>7}  {'Analyst':<13}  {'TargetUpside':>13}  {'vs52wLow':>9}  {'vs52wHigh':>10}")
-print(f"{'─'*130}")
-
-for ticker, status in picks.items():
-    try:
-        t = yf.Ticker(ticker)
-        i = t.info
-        price  = i.get("currentPrice") or i.get("regularMarketPrice") or 0
-        high52 = i.get("fiftyTwoWeekHigh") or 0
-        low52  = i.get("fiftyTwoWeekLow") or 0
-        fwd_pe = i.get("forwardPE") or 0
-        rev_g  = (i.get("revenueGrowth") or 0) * 100
-        gm     = (i.get("grossMargins") or 0) * 100
-        roe    = (i.get("returnOnEquity") or 0) * 100
-        analyst= i.get("recommendationKey") or "N/A"
-        target = i.get("targetMeanPrice") or 0
-        upside = ((target - price) / price * 100) if price and target else 0
-        vs_low = ((price - low52) / low52 * 100) if low52 else 0
-        vs_high= ((price - high52) / high52 * 100) if high52 else 0
-        print(f"[{status.upper():7}] {ticker:<6}  ${price:>8.2f}  {fwd_pe:>7.1f}  {rev_g:>7.1f}%  {gm:>6.1f}%  {roe:>6.1f}%  {analyst:<13}  {upside:>+12.1f}%  {vs_low:>+8.1f}%  {vs_high:>+9.1f}%")
-    except Exception as e:
-        print(f"[{status.upper():7}] {ticker:<6}  ERROR: {e}")
-
-print(f"{'─'*130}\n")
+SORT_KEYS = ["upside", "fwd_pe", "rev_growth", "gross_margin", "roe", "vs_low", "vs_high", "price"]
+
+WIDTH = 130
+
+
+def metrics(info: dict) -> dict:
+    """Deep-dive columns from a normalized analyzer.fetch_info dict (0 when missing)."""
+    price  = info.get("live_price") or 0
+    high52 = info.get("w52_high") or 0
+    low52  = info.get("w52_low") or 0
+    target = info.get("target_price") or 0
+    return {
+        "price":        price,
+        "fwd_pe":       info.get("fwd_pe") or 0,
+        "rev_growth":   (info.get("rev_growth") or 0) * 100,
+        "gross_margin": (info.get("gross_margin") or 0) * 100,
+        "roe":          (info.get("roe") or 0) * 100,
+        "analyst":      info.get("analyst") or "N/A",
+        "upside":       ((target - price) / price * 100) if price and target else 0,
+        "vs_low":       ((price - low52) / low52 * 100) if low52 else 0,
+        "vs_high":      ((price - high52) / high52 * 100) if high52 else 0,
+    }
+
+
+def format_row(ticker: str, status: str, m: dict | None) -> str:
+    if not m:
+        return f"[{status.upper():7}] {ticker:<6}  no data"
+    return (f"[{status.upper():7}] {ticker:<6}  ${m['price']:>8.2f}  {m['fwd_pe']:>7.1f}  "
+            f"{m['rev_growth']:>7.1f}%  {m['gross_margin']:>6.1f}%  {m['roe']:>6.1f}%  "
+            f"{m['analyst']:<13}  {m['upside']:>+12.1f}%  {m['vs_low']:>+8.1f}%  {m['vs_high']:>+9.1f}%")
+
+
+def print_table_header():
+    print(f"\n{'─'*WIDTH}")
+    print(f"{'Status':<9} {'Tick':<6}  {'Price':>9}  {'FwdPE':>7}  {'RevGrw':>8}  {'GM':>7}  {'ROE':>7}  {'Analyst':<13}  {'TargetUpside':>13}  {'vs52wLow':>9}  {'vs52wHigh':>10}")
+    print(f"{'─'*WIDTH}")
+
+
+def deep_dive(picks: dict[str, str], workers: int = FETCH_WORKERS,
+              timeout: float = FETCH_TIMEOUT, on_row=None) -> pd.DataFrame:
+    """
+    Fetch every ticker in `picks` ({ticker: status}) concurrently.
+    `on_row(ticker, status, metrics | None)` fires as each one arrives.
+    Returns one row per ticker that has a price, in `picks` order.
+    """
+    tickers = list(picks)
+
+    def arrived(ticker: str, info: dict):
+        if on_row:
+            on_row(ticker, picks[ticker], metrics(info) if info.get("live_price") else None)
+
+    infos = fetch_many(tickers, fetch_info, workers, timeout, on_result=arrived)
+    rows = [{"ticker": t, "status": picks[t], **metrics(info)}
+            for t, info in zip(tickers, infos) if info.get("live_price")]
+    return pd.DataFrame(rows)
+
+
+def resolve_picks(tickers: list[str], holdings_file: Path = HOLDINGS_FILE) -> dict[str, str]:
+    """Tag each ticker 'current' if it's already in holdings.csv, else 'new'."""
+    held = set()
+    if holdings_file.exists():
+        held = set(pd.read_csv(holdings_file)["ticker"].astype(str).str.upper())
+    return {t: "current" if t in held else "new" for t in tickers}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Focused metrics table for a set of tickers")
+    parser.add_argument("tickers", nargs="*", help="Tickers to analyze (default: built-in picks)")
+    parser.add_argument("--file",    type=Path, help="Read tickers from a file (CSV or one per line)")
+    parser.add_argument("--sort",    choices=SORT_KEYS, default="upside",
+                        help="Column to sort the final table by (default upside)")
+    parser.add_argument("--asc",     action="store_true", help="Sort ascending")
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS,
+                        help=f"Concurrent yfinance fetches (default {FETCH_WORKERS})")
+    parser.add_argument("--timeout", type=float, default=FETCH_TIMEOUT,
+                        help=f"Per-ticker fetch timeout in seconds (default {FETCH_TIMEOUT:g})")
+    parser.add_argument("--offline", action="store_true",
+                        help="No network — serve last known values from the cache")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Bypass the on-disk yfinance cache")
+    parser.add_argument("--profile", nargs="?", type=Path, const=True, metavar="JSON",
+                        help="Print phase timings and fetch stats, and save them as JSON "
+                             "(default profiles/deep_dive-<time>.json)")
+    args = parser.parse_args()
+
+    tickers = [t.upper() for t in args.tickers]
+    if args.file:
+        tickers += load_universe(args.file)
+    picks = resolve_picks(list(dict.fromkeys(tickers))) if tickers else DEFAULT_PICKS
+
+    configure_cache(offline=args.offline, enabled=not args.no_cache)
+    if not args.offline:
+        load_yfinance()
+
+    # Stream rows in arrival order…
+    print_table_header()
+    with PROFILE.phase("deep_dive"):
+        df = deep_dive(picks, args.workers, args.timeout,
+                       on_row=lambda t, status, m: print(format_row(t, status, m), flush=True))
+    print(f"{'─'*WIDTH}")
+
+    # …then re-render everything sorted
+    if len(df) > 1:
+        with PROFILE.phase("render_sorted"):
+            df = df.sort_values(args.sort, ascending=args.asc, kind="stable")
+            print(f"\nSorted by {args.sort} ({'asc' if args.asc else 'desc'}):")
+            print_table_header()
+            for _, r in df.iterrows():
+                print(format_row(r["ticker"], r["status"], r.to_dict()))
+            print(f"{'─'*WIDTH}")
+
+    if args.profile:
+        PROFILE.print_summary()
+        path = PROFILE.save("deep_dive", None if args.profile is True else args.profile)
+        print(f"\n  Profile saved → {path}")
+
+    if YAHOO.summary():
+        print(f"⚠  {YAHOO.summary()}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
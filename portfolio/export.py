@@ -0,0 +1,76 @@
+"""
+Result export
+=============
+Enriched holdings, sector/horizon aggregates and screen candidates written
+straight from the DataFrames as typed JSON Lines or Arrow IPC files, so
+dashboards can load them instead of scraping report.md:
+
+    export/holdings.jsonl     export/sectors.jsonl
+    export/horizons.jsonl     export/candidates.jsonl
+    export/portfolios.jsonl   (batch runs)
+
+Every file a run doesn't produce (no --screen, a single portfolio) is removed
+for the chosen format, so nothing left over from an earlier run reads as
+current.
+
+Both formats carry the same values: missing and infinite numbers are null,
+floats keep full float64 precision (JSON uses Python's round-trip repr), and
+mixed-type columns become text by the same rule as the snapshot store.
+Arrow files read back with pd.read_feather / pyarrow.ipc.open_file.
+"""
+
+import json
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from store import normalize_types, write_arrow
+
+FORMATS = ("jsonl", "arrow")
+EXPORTS = ("holdings", "sectors", "horizons", "candidates", "portfolios")
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def write_jsonl(df: pd.DataFrame, path: Path):
+    """One JSON object per row, NaN → null."""
+    df = normalize_types(df)
+    records = df.astype(object).where(df.notna(), None).to_dict("records")
+    with path.open("w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, default=_json_default, allow_nan=False, ensure_ascii=False) + "\n")
+
+
+def export_results(frames: dict[str, pd.DataFrame], out_dir: Path, fmt: str = "jsonl") -> list[Path]:
+    """
+    Write each non-empty frame ({name: df}) to <out_dir>/<name>.<fmt>, and
+    delete the <out_dir>/<name>.<fmt> of every other EXPORTS name.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, df in frames.items():
+        if df is None or df.empty:
+            continue
+        df = df.replace([np.inf, -np.inf], np.nan)
+        path = out_dir / f"{name}.{fmt}"
+        if fmt == "jsonl":
+            write_jsonl(df, path)
+        else:
+            write_arrow(df, path)
+        paths.append(path)
+    for name in EXPORTS:
+        path = out_dir / f"{name}.{fmt}"
+        if path not in paths:
+            path.unlink(missing_ok=True)
+    return paths
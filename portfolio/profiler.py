@@ -0,0 +1,156 @@
+"""
+Run profiler
+============
+Phase wall times, per-ticker fetch latency, request / empty-response counts
+and cache hit ratios for analyzer.py and deep_dive.py. Always recording (it's
+a few dict updates per request); `--profile` prints the table and writes a
+JSON file in a stable key order so two runs can be diffed:
+
+    diff profiles/analyzer-20261018-093000.json profiles/analyzer-20261018-101500.json
+"""
+
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_DIR = Path(__file__).parent / "profiles"
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000]   # upper edges; last bucket is open
+SLOWEST = 10
+
+
+class Profiler:
+    """Thread-safe counters for one run. State is plain data so shards can merge it back."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self.phases = {}                   # name → ms, in first-seen order
+        self.latency = defaultdict(dict)   # kind → {key: ms}
+        self.requests = Counter()          # kind → requests
+        self.empty = Counter()             # kind → requests that came back empty
+        self.cache = defaultdict(Counter)  # kind → {"hits": n, "misses": n}
+
+    # ── Recording ────────────────────────────────────────────────────────────
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + ms
+
+    @contextmanager
+    def fetch(self, kind: str, key: str):
+        """Time one request; the caller sets box["empty"] = True when nothing usable came back."""
+        box = {"empty": False}
+        start = time.perf_counter()
+        try:
+            yield box
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.requests[kind] += 1
+                self.empty[kind] += box["empty"]
+                self.latency[kind][key] = max(ms, self.latency[kind].get(key, 0.0))
+
+    def cache_lookup(self, kind: str, hits: int, misses: int):
+        with self._lock:
+            self.cache[kind]["hits"] += hits
+            self.cache[kind]["misses"] += misses
+
+    # ── Shards ───────────────────────────────────────────────────────────────
+
+    def state(self) -> dict:
+        with self._lock:
+            return {
+                "latency":  {k: dict(v) for k, v in self.latency.items()},
+                "requests": dict(self.requests),
+                "empty":    dict(self.empty),
+                "cache":    {k: dict(v) for k, v in self.cache.items()},
+            }
+
+    def merge(self, state: dict):
+        """Fold in a state() from another process (phases stay the parent's)."""
+        with self._lock:
+            for kind, keys in state["latency"].items():
+                for key, ms in keys.items():
+                    self.latency[kind][key] = max(ms, self.latency[kind].get(key, 0.0))
+            self.requests.update(state["requests"])
+            self.empty.update(state["empty"])
+            for kind, counts in state["cache"].items():
+                self.cache[kind].update(counts)
+
+    # ── Output ───────────────────────────────────────────────────────────────
+
+    def histogram(self, kind: str) -> dict[str, int]:
+        labels = [f"<{edge}ms" for edge in LATENCY_BUCKETS_MS] + [f">={LATENCY_BUCKETS_MS[-1]}ms"]
+        counts = Counter()
+        for ms in self.latency[kind].values():
+            i = next((i for i, edge in enumerate(LATENCY_BUCKETS_MS) if ms < edge), len(LATENCY_BUCKETS_MS))
+            counts[labels[i]] += 1
+        return {label: counts[label] for label in labels}
+
+    def report(self) -> dict:
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "phases":   {name: round(ms, 1) for name, ms in self.phases.items()},
+            "fetches": {
+                kind: {
+                    "requests":  self.requests[kind],
+                    "empty":     self.empty[kind],
+                    "histogram": self.histogram(kind),
+                    "slowest":   {k: round(ms, 1) for k, ms in sorted(
+                        self.latency[kind].items(), key=lambda kv: -kv[1])[:SLOWEST]},
+                    "latency_ms": {k: round(ms, 1) for k, ms in sorted(self.latency[kind].items())},
+                }
+                for kind in sorted(self.requests)
+            },
+            "cache": {
+                kind: {**self.cache[kind], "hit_ratio": round(
+                    self.cache[kind]["hits"] / max(1, self.cache[kind]["hits"] + self.cache[kind]["misses"]), 3)}
+                for kind in sorted(self.cache)
+            },
+        }
+
+    def print_summary(self):
+        r = self.report()
+        print(f"\n  Profile  ·  {r['total_ms'] / 1000:.2f}s total")
+        print(f"  {'Phase':<24} {'Wall':>10}  {'%':>6}")
+        print(f"  {'─'*44}")
+        for name, ms in r["phases"].items():
+            print(f"  {name:<24} {ms / 1000:>9.2f}s  {ms / max(r['total_ms'], 1e-9) * 100:>5.1f}%")
+
+        if r["fetches"]:
+            print(f"\n  {'Fetch':<10} {'Requests':>9} {'Empty':>6}  Slowest")
+            print(f"  {'─'*62}")
+            for kind, f in r["fetches"].items():
+                slow = ", ".join(f"{k} {ms / 1000:.1f}s" for k, ms in list(f["slowest"].items())[:3])
+                print(f"  {kind:<10} {f['requests']:>9} {f['empty']:>6}  {slow}")
+            for kind, f in r["fetches"].items():
+                bars = "  ".join(f"{label} {n}" for label, n in f["histogram"].items() if n)
+                print(f"  {kind} latency: {bars}")
+
+        if r["cache"]:
+            print("\n  Cache hits: " + " · ".join(
+                f"{kind} {c['hit_ratio']:.0%} ({c['hits']}/{c['hits'] + c['misses']})"
+                for kind, c in r["cache"].items()))
+
+    def save(self, tool: str, path: Path = None) -> Path:
+        path = path or PROFILE_DIR / f"{tool}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        return path
+
+
+# Shared by analyzer.py and deep_dive.py within one process
+PROFILE = Profiler()
@@ -0,0 +1,135 @@
+"""
+Portfolio Risk Engine
+=====================
+Volatility, covariance/correlation, beta and Value-at-Risk from a date ×
+ticker frame of daily closes. Everything is a handful of NumPy matrix ops on
+the return matrix, so a few hundred positions over five years takes
+milliseconds once the price history is cached (analyzer.fetch_price_history).
+Holdings with a short history are compared over the days they actually
+traded (pairwise-complete), not padded with zero returns.
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+CONFIDENCE   = 0.95
+MIN_OBS      = 20      # daily returns a holding needs to be included
+
+
+def daily_returns(prices: pd.DataFrame) -> pd.DataFrame:
+    """
+    Simple daily returns on weekdays only — crypto trades 7 days a week, so
+    weekend moves are folded into Monday instead of diluting equity vol with
+    zero-return days. Days before a ticker's first close stay NaN.
+    """
+    prices = prices[prices.index.dayofweek < 5].ffill()
+    return prices.pct_change(fill_method=None).iloc[1:].dropna(axis=1, how="all")
+
+
+def pairwise_cov(R: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Covariance of the columns of `R` (T × N, NaN = no observation) over
+    pairwise-complete days, so a short history is compared only over the
+    days it exists. Returns (cov, var, n): var[i, j] is column i's variance
+    over the days it shares with j, n[i, j] the number of shared days.
+    """
+    M = (~np.isnan(R)).astype(float)
+    X = np.nan_to_num(R)
+    n = M.T @ M
+    sx = X.T @ M                                # sx[i, j] = Σ r_i over days j also has
+    sxx = (X * X).T @ M
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = (X.T @ X - sx * sx.T / n) / (n - 1)
+        var = (sxx - sx * sx / n) / (n - 1)
+    return cov, var, n
+
+
+def analyze_risk(prices: pd.DataFrame, values: pd.Series, benchmark: str = "SPY",
+                 confidence: float = CONFIDENCE) -> dict:
+    """
+    Risk figures for a portfolio holding `values` ($ by ticker) given daily
+    closes `prices` (which should include the benchmark column).
+
+    Covariances, vols and betas use pairwise-complete days (see pairwise_cov)
+    rather than zero-filling, so a recent IPO isn't made to look calm; holdings
+    with fewer than MIN_OBS returns are left out. `holding_obs` gives each
+    holding's return count so short histories are visible.
+
+    Returns a dict with scalar stats plus `cov` / `corr` DataFrames (annualized
+    covariance), per-ticker `weights` / `holding_vol` / `holding_beta` / `risk_share`
+    / `holding_obs`, and the most correlated holding pairs.
+    """
+    if prices.empty:
+        return {}
+    rets = daily_returns(prices)
+    obs = rets.notna().sum()
+    held = [t for t in values.index if t in rets.columns and values[t] > 0 and obs[t] >= MIN_OBS]
+    if not held:
+        return {}
+
+    cols = held + ([benchmark] if benchmark in rets.columns and benchmark not in held else [])
+    R = rets[cols].to_numpy(dtype=float)            # T × N (+ benchmark), NaN before listing
+    cov_d, var_d, n_d = pairwise_cov(R)
+    k = len(held)
+    w = values[held].to_numpy(dtype=float)
+    total = w.sum()
+    w = w / total
+
+    cov = cov_d[:k, :k] * TRADING_DAYS
+    sd = np.sqrt(np.diag(cov))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = cov_d[:k, :k] / np.sqrt(var_d[:k, :k] * var_d[:k, :k].T)
+
+    # Pairwise estimates needn't form a PSD matrix; clip the rare negative variance
+    port_var = max(float(w @ cov @ w), 0.0)
+    vol = np.sqrt(port_var)
+    risk_share = w * (cov @ w) / port_var if port_var > 0 else np.zeros_like(w)
+
+    beta = betas = None
+    if benchmark in rets.columns:
+        b = cols.index(benchmark)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            betas = cov_d[:k, b] / var_d[b, :k]     # benchmark variance over each holding's days
+        if np.isfinite(betas).any():
+            beta = float(np.nansum(w * betas))
+
+    # Daily portfolio return over the holdings trading that day, reweighted to 1
+    present = ~np.isnan(R[:, :k])
+    live_w = present @ w
+    with np.errstate(invalid="ignore", divide="ignore"):
+        port = (np.nan_to_num(R[:, :k]) @ w) / live_w
+    port = port[live_w > 0]
+
+    # 1-day VaR, as a positive loss
+    z = NormalDist().inv_cdf(confidence)
+    var_hist = -np.percentile(port, (1 - confidence) * 100)
+    var_param = z * np.sqrt(port_var / TRADING_DAYS) - port.mean()
+
+    # Most correlated distinct pairs
+    iu, ju = np.triu_indices(k, k=1)
+    order = np.argsort(-np.nan_to_num(corr[iu, ju], nan=-2))[:5]
+    pairs = [(held[iu[i]], held[ju[i]], float(corr[iu[i], ju[i]])) for i in order]
+
+    return {
+        "tickers":      held,
+        "coverage":     total / values[values > 0].sum(),
+        "days":         len(R),
+        "total":        total,
+        "weights":      pd.Series(w, index=held),
+        "vol":          float(vol),
+        "beta":         beta,
+        "benchmark":    benchmark,
+        "confidence":   confidence,
+        "var_hist":     float(var_hist),
+        "var_param":    float(var_param),
+        "cov":          pd.DataFrame(cov, index=held, columns=held),
+        "corr":         pd.DataFrame(corr, index=held, columns=held),
+        "holding_vol":  pd.Series(sd, index=held),
+        "holding_beta": pd.Series(betas, index=held) if betas is not None else None,
+        "holding_obs":  obs[held].astype(int),
+        "risk_share":   pd.Series(risk_share, index=held),
+        "top_pairs":    pairs,
+    }
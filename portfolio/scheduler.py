@@ -0,0 +1,164 @@
+"""
+Request scheduler for Yahoo Finance
+===================================
+One shared gate in front of every yfinance call:
+
+  - token bucket whose rate adapts (AIMD): +RATE_STEP per success, halved
+    on failure at most once per CUT_INTERVAL, bounded by [min_rate, max_rate]
+    (MIN_RATE and MAX_RATE unless split across worker processes)
+  - retries with jittered exponential backoff
+  - circuit breaker: after BREAKER_THRESHOLD consecutive failures, calls
+    fail fast for BREAKER_COOLDOWN seconds, then one trial call is let through
+  - per-key failure counts, so throttled tickers show up in the run summary
+    instead of silently becoming empty rows
+
+Only throttling (429 / "rate limited") and transient network or 5xx errors
+count as failures above. Anything else — a delisted or renamed ticker, a bad
+symbol — is the ticker's problem, not Yahoo's: it fails on the first attempt
+and leaves the rate and the breaker alone.
+"""
+
+import random
+import re
+import threading
+import time
+from collections import Counter
+
+RATE              = 8.0    # starting requests / second
+MIN_RATE          = 0.5
+MAX_RATE          = 32.0
+RATE_STEP         = 0.25   # additive increase per success
+CUT_INTERVAL      = 1.0    # seconds — a burst of failures only halves the rate once
+BURST             = 8      # bucket capacity
+RETRIES           = 3
+BACKOFF           = 0.5    # seconds, doubled per attempt
+MAX_BACKOFF       = 20.0
+BREAKER_THRESHOLD = 10
+BREAKER_COOLDOWN  = 60.0
+
+TRANSIENT_STATUS  = {429, 500, 502, 503, 504}
+# yfinance / requests / curl_cffi error class names and messages for throttling or a flaky network
+TRANSIENT_TYPES   = re.compile(r"RateLimit|Timeout|ConnectionError|ConnectError|ProxyError|ChunkedEncoding", re.I)
+TRANSIENT_TEXT    = re.compile(r"too many requests|rate limit|\b429\b|timed out|temporarily unavailable", re.I)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling Yahoo while the breaker is open."""
+
+
+def is_transient(exc: Exception) -> bool:
+    """True for errors worth retrying: throttling, timeouts, dropped connections, 5xx."""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None) or getattr(exc, "status_code", None)
+    if status is not None:
+        return status in TRANSIENT_STATUS
+    return any(TRANSIENT_TYPES.search(cls.__name__) for cls in type(exc).__mro__) \
+        or bool(TRANSIENT_TEXT.search(str(exc)))
+
+
+class RequestScheduler:
+    def __init__(self, rate: float = RATE, retries: int = RETRIES,
+                 min_rate: float = MIN_RATE, max_rate: float = MAX_RATE):
+        self.rate = rate
+        self.retries = retries
+        self.min_rate = min_rate     # AIMD bounds; a process-pool shard gets its share of them
+        self.max_rate = max_rate
+        self.failures = Counter()    # key → failed attempts
+        self.short_circuited = 0     # calls refused while the breaker was open
+        self.breaker_trips = 0
+        self._lock = threading.Lock()
+        self._tokens = float(BURST)
+        self._refilled = time.monotonic()
+        self._consecutive = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._last_cut = 0.0
+
+    # ── Token bucket ─────────────────────────────────────────────────────────
+
+    def _acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(BURST, self._tokens + (now - self._refilled) * self.rate)
+                self._refilled = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    # ── Circuit breaker ──────────────────────────────────────────────────────
+
+    def _admit(self):
+        with self._lock:
+            if self._consecutive < BREAKER_THRESHOLD:
+                return
+            if time.monotonic() < self._open_until or self._probing:
+                self.short_circuited += 1
+                raise CircuitOpenError("Yahoo circuit breaker open")
+            self._probing = True   # half-open: let one trial call through
+
+    def _record(self, key: str, ok: bool, transient: bool = True):
+        with self._lock:
+            self._probing = False
+            if ok:
+                self._consecutive = 0
+                self.rate = min(self.max_rate, self.rate + RATE_STEP)
+                return
+            self.failures[key] += 1
+            if not transient:
+                self._consecutive = 0   # Yahoo answered; the request itself was bad
+                return
+            self._consecutive += 1
+            now = time.monotonic()
+            if now - self._last_cut >= CUT_INTERVAL:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._last_cut = now
+            if self._consecutive >= BREAKER_THRESHOLD:
+                if now >= self._open_until:
+                    self.breaker_trips += 1
+                self._open_until = now + BREAKER_COOLDOWN
+
+    # ── Public API ───────────────────────────────────────────────────────────
+
+    def call(self, key: str, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) under the rate limit, retrying transient
+        failures with jittered backoff. Raises a non-transient error at once,
+        the last transient one once retries are exhausted, or
+        CircuitOpenError while the breaker is open.
+        """
+        for attempt in range(self.retries + 1):
+            self._admit()
+            self._acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                transient = is_transient(e)
+                self._record(key, ok=False, transient=transient)
+                if not transient or attempt == self.retries:
+                    raise
+                delay = min(MAX_BACKOFF, BACKOFF * 2 ** attempt)
+                time.sleep(random.uniform(0, delay))   # full jitter
+            else:
+                self._record(key, ok=True)
+                return result
+
+    def summary(self) -> str:
+        """One-line failure summary for the end of a run ('' when clean)."""
+        if not self.failures and not self.short_circuited:
+            return ""
+        worst = ", ".join(f"{k}×{n}" for k, n in self.failures.most_common(8))
+        line = f"{sum(self.failures.values())} failed yfinance requests across {len(self.failures)} keys"
+        if worst:
+            line += f" ({worst})"
+        if self.breaker_trips:
+            line += f" · breaker tripped {self.breaker_trips}× · {self.short_circuited} calls skipped"
+        return line
+
+
+# Shared by analyzer.py and deep_dive.py within one process
+YAHOO = RequestScheduler()
@@ -0,0 +1,101 @@
+"""
+Snapshot Store
+==============
+Every analyzer run's enriched holdings and screen candidates, kept as Arrow
+IPC files partitioned by date:
+
+    snapshots/2026-10-18/holdings-153012.arrow
+    snapshots/2026-10-18/candidates-153012.arrow
+
+Reads are memory-mapped, so loading months of history for an allocation or
+valuation comparison is a local file read, not another pass over yfinance.
+
+Usage:
+    from store import load_snapshots
+    df = load_snapshots("holdings", start="2026-09-01", latest_per_day=True)
+"""
+
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+SNAPSHOT_DIR = Path(__file__).parent / "snapshots"
+KINDS = ("holdings", "candidates")
+
+
+def normalize_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Mixed-type object columns (e.g. N/A strings next to floats) can't be typed — make them text."""
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        types = {type(v) for v in df[col].dropna()}
+        if len(types) > 1:
+            df[col] = df[col].map(lambda v: None if pd.isna(v) else str(v))
+    return df
+
+
+def write_arrow(df: pd.DataFrame, path: Path):
+    """Write `df` as one Arrow IPC file (NaN → null)."""
+    table = pa.Table.from_pandas(normalize_types(df), preserve_index=False)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def save_snapshot(frames: dict[str, pd.DataFrame], when: datetime | None = None,
+                  root: Path = SNAPSHOT_DIR) -> list[Path]:
+    """Write each non-empty frame ({kind: df}) as <root>/<date>/<kind>-<HHMMSS>.arrow."""
+    when = when or datetime.now()
+    day_dir = root / when.strftime("%Y-%m-%d")
+    day_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for kind, df in frames.items():
+        if df is None or df.empty:
+            continue
+        path = day_dir / f"{kind}-{when.strftime('%H%M%S')}.arrow"
+        write_arrow(df, path)
+        paths.append(path)
+    return paths
+
+
+def _read(path: Path) -> pd.DataFrame:
+    with pa.memory_map(str(path), "r") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def snapshot_files(kind: str, start=None, end=None, root: Path = SNAPSHOT_DIR) -> list[Path]:
+    """Snapshot files of `kind` with start <= date <= end (inclusive), oldest first."""
+    if kind not in KINDS:
+        raise ValueError(f"kind must be one of {KINDS}, got {kind!r}")
+    start = pd.Timestamp(start).date() if start else date.min
+    end   = pd.Timestamp(end).date() if end else date.max
+    files = []
+    for day_dir in sorted(root.glob("????-??-??")):
+        day = date.fromisoformat(day_dir.name)
+        if start <= day <= end:
+            files += sorted(day_dir.glob(f"{kind}-*.arrow"))
+    return files
+
+
+def load_snapshots(kind: str, start=None, end=None, latest_per_day: bool = False,
+                   root: Path = SNAPSHOT_DIR) -> pd.DataFrame:
+    """
+    Load every `kind` snapshot between start and end (dates or ISO strings,
+    inclusive) into one frame with `date` and `run_at` columns prepended.
+    latest_per_day keeps only the last run of each day.
+    """
+    files = snapshot_files(kind, start, end, root)
+    if latest_per_day:
+        by_day = {f.parent.name: f for f in files}
+        files = list(by_day.values())
+
+    frames = []
+    for f in files:
+        df = _read(f)
+        run_at = datetime.strptime(f"{f.parent.name} {f.stem.split('-')[-1]}", "%Y-%m-%d %H%M%S")
+        df.insert(0, "run_at", run_at)
+        df.insert(0, "date", run_at.date())
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,138 @@
+"""
+Live dashboard
+==============
+`analyzer.py --watch` keeps the portfolio on screen during market hours. Each
+tick is one bulk quote download; fundamentals are never refetched.
+
+Positions are held as implied shares (value_usd / price at start), so a tick
+only touches the tickers whose price moved: their value deltas are added to
+the running total and scattered into the sector totals with np.add.at. The
+frame is rendered to lines and only lines that differ from the last frame are
+repainted (ANSI cursor moves); without a TTY the changed lines are printed.
+"""
+
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+WATCH_INTERVAL = 60.0   # seconds between quote polls
+
+CLEAR  = "\x1b[2J\x1b[H"
+EOL    = "\x1b[K"          # clear to end of line
+HIDE   = "\x1b[?25l"
+SHOW   = "\x1b[?25h"
+
+
+class LiveBoard:
+    """Incrementally updated portfolio values plus the last rendered frame."""
+
+    def __init__(self, holdings: pd.DataFrame, top: int = 10):
+        df = holdings.groupby("ticker", sort=False).agg(
+            value_usd=("value_usd", "sum"), sector=("sector", "first"))
+        price = (holdings.groupby("ticker", sort=False)["live_price"].first()
+                 if "live_price" in holdings.columns else pd.Series(np.nan, index=df.index))
+        price = pd.to_numeric(price, errors="coerce").reindex(df.index)
+
+        self.tickers = df.index.to_numpy()
+        self.value = df["value_usd"].to_numpy(dtype=float, copy=True)
+        self.price = price.to_numpy(dtype=float, copy=True)
+        self.start_price = self.price.copy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.shares = np.where(self.price > 0, self.value / self.price, np.nan)
+        self.sector_codes, self.sectors = pd.factorize(df["sector"].fillna("Other"))
+        self.sector_value = np.zeros(len(self.sectors))
+        np.add.at(self.sector_value, self.sector_codes, self.value)
+        self.total = self.value.sum()
+        self.start_total = self.total
+        self.top = top
+        self.lines: list[str] = []
+        self.ticks = 0
+
+    def apply(self, quotes: pd.Series) -> int:
+        """Fold a {ticker: price} quote series in; returns how many positions moved."""
+        new = quotes.reindex(self.tickers).to_numpy(dtype=float)
+        # Positions without a starting price take their share count from the first quote
+        unpriced = np.isnan(self.shares) & (new > 0)
+        self.shares[unpriced] = self.value[unpriced] / new[unpriced]
+        self.start_price[unpriced] = new[unpriced]
+        self.price[unpriced] = new[unpriced]
+
+        changed = np.flatnonzero((new > 0) & (new != self.price))
+        if changed.size:
+            delta = self.shares[changed] * new[changed] - self.value[changed]
+            self.value[changed] += delta
+            self.price[changed] = new[changed]
+            np.add.at(self.sector_value, self.sector_codes[changed], delta)
+            self.total += delta.sum()
+        self.ticks += 1
+        return changed.size
+
+    def render(self, interval: float) -> list[str]:
+        change = self.total - self.start_total
+        pct = change / self.start_total * 100 if self.start_total else 0.0
+        lines = [
+            f"  LIVE  ·  {datetime.now():%H:%M:%S}  ·  every {interval:g}s  ·  tick {self.ticks}  ·  Ctrl-C to stop",
+            f"  Total value : ${self.total:>13,.2f}   {change:>+12,.2f} ({pct:+.2f}%) since start",
+            "",
+            f"  {'Sector':<30} {'Value':>12}  {'%':>6}",
+            f"  {'─'*52}",
+        ]
+        order = np.argsort(-self.sector_value, kind="stable")
+        lines += [f"  {self.sectors[i]:<30} ${self.sector_value[i]:>10,.0f}  "
+                  f"{self.sector_value[i] / self.total * 100:>5.1f}%" for i in order]
+
+        n = min(self.top, len(self.value))
+        top = np.argpartition(-self.value, n - 1)[:n] if n else np.array([], dtype=int)
+        top = top[np.argsort(-self.value[top], kind="stable")]
+        lines += ["", f"  {'Ticker':<8} {'Value':>13}  {'%':>6}  {'Price':>10}  {'Chg':>7}", f"  {'─'*52}"]
+        for i in top:
+            if self.price[i] > 0:
+                chg = (self.price[i] / self.start_price[i] - 1) * 100
+                quote = f"${self.price[i]:>9,.2f}  {chg:>+6.2f}%"
+            else:
+                quote = f"{'N/A':>10}  {'':>7}"
+            lines.append(f"  {self.tickers[i]:<8} ${self.value[i]:>11,.0f}  "
+                         f"{self.value[i] / self.total * 100:>5.1f}%  {quote}")
+        return lines
+
+    def repaint(self, lines: list[str], out=sys.stdout):
+        """Write only the lines that changed since the previous frame."""
+        tty = out.isatty()
+        if tty and not self.lines:
+            out.write(CLEAR + HIDE)
+        for row, line in enumerate(lines):
+            if row < len(self.lines) and self.lines[row] == line:
+                continue
+            out.write(f"\x1b[{row + 1};1H{line}{EOL}" if tty else line + "\n")
+        if tty and len(lines) < len(self.lines):
+            out.write(f"\x1b[{len(lines) + 1};1H\x1b[J")   # frame shrank: clear the rest
+        out.flush()
+        self.lines = lines
+
+
+def watch_portfolio(holdings: pd.DataFrame, fetch_prices, interval: float = WATCH_INTERVAL,
+                    top: int = 10, ticks: int = 0):
+    """
+    Poll `fetch_prices(tickers) -> Series` every `interval` seconds and keep the
+    dashboard current. Runs until Ctrl-C (or for `ticks` polls when > 0).
+    """
+    board = LiveBoard(holdings, top)
+    tickers = board.tickers.tolist()
+    next_tick = time.monotonic()
+    try:
+        while True:
+            board.apply(fetch_prices(tickers))
+            board.repaint(board.render(interval))
+            if ticks and board.ticks >= ticks:
+                break
+            next_tick += interval
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if sys.stdout.isatty():
+            sys.stdout.write(f"\x1b[{len(board.lines) + 1};1H{SHOW}\n")
+            sys.stdout.flush()